@@ -1,34 +1,170 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
+import numpy as np
+from PySide6.QtCore import QSignalBlocker, QTimer
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QPlainTextEdit
 
+from core.lume_runtime import build_final_gcode_cached
 from core.project_model import GCodeJob
 
 
+# Texts larger than this are loaded in slices so the UI can paint in between.
+INITIAL_LOAD_CHARS = 512_000
+LOAD_CHUNK_CHARS = 64_000
+
+# Lines longer than this (e.g. machine-generated comment blobs) are split
+# into display-only continuation lines; QTextDocument layout degrades badly
+# on pathologically long blocks. Every piece but the last ends with the mark.
+LONG_LINE_CHARS = 4096
+CONTINUATION_MARK = "\u21a9"
+
+
+def _wrap_long_lines(text: str) -> tuple[str, Optional[np.ndarray]]:
+    """Split over-long lines; return (display text, display->source line map).
+
+    The map is None when nothing had to be split (display == source).
+    """
+    lines = text.split("\n")
+    if max(map(len, lines), default=0) <= LONG_LINE_CHARS:
+        return text, None
+
+    out: List[str] = []
+    pieces = np.ones(len(lines), dtype=np.int64)
+    for i, line in enumerate(lines):
+        if len(line) <= LONG_LINE_CHARS:
+            out.append(line)
+            continue
+        chunks = [line[k : k + LONG_LINE_CHARS] for k in range(0, len(line), LONG_LINE_CHARS)]
+        out.extend(chunk + CONTINUATION_MARK for chunk in chunks[:-1])
+        out.append(chunks[-1])
+        pieces[i] = len(chunks)
+
+    display_to_source = np.repeat(np.arange(1, len(lines) + 1, dtype=np.int32), pieces)
+    return "\n".join(out), display_to_source
+
+
+def _unwrap_long_lines(text: str) -> str:
+    """Inverse of _wrap_long_lines: re-join continuation lines."""
+    if CONTINUATION_MARK not in text:
+        return text
+    return text.replace(CONTINUATION_MARK + "\n", "")
+
+
 class GCodeEditor(QPlainTextEdit):
     """Text editor used to display and edit the raw G-code of the selected job.
 
     For Feature 2 the editor becomes editable; MainWindow is responsible for
     taking the current text and re-parsing it into the job when the user
     chooses "Apply G-code edits".
+
+    Huge files are loaded incrementally: the first INITIAL_LOAD_CHARS are
+    shown immediately and the rest is appended from the event loop in
+    LOAD_CHUNK_CHARS slices (see finish_pending_load).
     """
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.current_job: Optional[GCodeJob] = None
+        # Text still to append during an incremental load, and how much of
+        # it has been appended so far.
+        self._pending_text: str = ""
+        self._pending_pos: int = 0
+        # 1-based source line for each display block; None = identity.
+        self._display_to_source: Optional[np.ndarray] = None
         self.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.setTabStopDistance(4 * self.fontMetrics().horizontalAdvance(" "))
 
     def set_job(self, job: GCodeJob) -> None:
         self.current_job = job
-        from core.lume_runtime import build_final_gcode
 
         # Show the final Lume G-code (header + body + footer) so that
         # replaced header/footer and offsets are visible to the user.
-        text = build_final_gcode(job)
-        self.setPlainText(text)
-        cursor = self.textCursor()
-        cursor.setPosition(0)
-        self.setTextCursor(cursor)
+        text, display_to_source = _wrap_long_lines(build_final_gcode_cached(job))
+
+        # Programmatic load: no cursorPositionChanged storm. Callers that
+        # track the cursor should refresh once afterwards.
+        with QSignalBlocker(self):
+            if len(text) > INITIAL_LOAD_CHARS:
+                self.setPlainText(text[:INITIAL_LOAD_CHARS])
+                self._pending_text = text
+                self._pending_pos = INITIAL_LOAD_CHARS
+                self.setUndoRedoEnabled(False)
+                QTimer.singleShot(0, self._append_next_chunk)
+            else:
+                self.setPlainText(text)
+            self._display_to_source = display_to_source
+            cursor = self.textCursor()
+            cursor.setPosition(0)
+            self.setTextCursor(cursor)
+
+    def source_line(self, block_number: int) -> int:
+        """1-based source line number shown in display block `block_number`."""
+        mapping = self._display_to_source
+        if mapping is None:
+            return block_number + 1
+        if block_number >= len(mapping):
+            # Lines typed after the last mapped one
+            return int(mapping[-1]) + block_number - len(mapping) + 1
+        return int(mapping[block_number])
+
+    def block_for_source_line(self, line: int) -> int:
+        """First display block showing 1-based source line `line`."""
+        mapping = self._display_to_source
+        if mapping is None:
+            return max(line - 1, 0)
+        return int(np.searchsorted(mapping, line, side="left"))
+
+    def source_text(self) -> str:
+        """Full editor text with display-only line splits undone."""
+        self.finish_pending_load()
+        text = self.toPlainText()
+        if self._display_to_source is None:
+            # Nothing was split: a mark at a line end is the user's text
+            return text
+        return _unwrap_long_lines(text)
+
+    def finish_pending_load(self) -> None:
+        """Append any remaining text synchronously (e.g. before toPlainText)."""
+        if not self._pending_text:
+            return
+        self._append_text(self._pending_text[self._pending_pos :])
+        self._cancel_pending_load()
+
+    # Programmatic text replacement cancels an unfinished incremental load.
+    def setPlainText(self, text: str) -> None:  # type: ignore[override]
+        self._cancel_pending_load()
+        self._display_to_source = None
+        super().setPlainText(text)
+
+    def clear(self) -> None:  # type: ignore[override]
+        self._cancel_pending_load()
+        self._display_to_source = None
+        super().clear()
+
+    # ----------------------------------------------------------------- helpers
+
+    def _cancel_pending_load(self) -> None:
+        if self._pending_text:
+            self._pending_text = ""
+            self._pending_pos = 0
+            self.setUndoRedoEnabled(True)
+
+    def _append_next_chunk(self) -> None:
+        if not self._pending_text:
+            return
+        start = self._pending_pos
+        end = start + LOAD_CHUNK_CHARS
+        self._append_text(self._pending_text[start:end])
+        if end < len(self._pending_text):
+            self._pending_pos = end
+            QTimer.singleShot(0, self._append_next_chunk)
+        else:
+            self._cancel_pending_load()
+
+    def _append_text(self, text: str) -> None:
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import (
     QDialog,
     QDockWidget,
@@ -12,6 +15,8 @@ from PySide6.QtWidgets import (
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
+    QProgressDialog,
     QPushButton,
     QStatusBar,
     QToolBar,
@@ -19,16 +24,50 @@ from PySide6.QtWidgets import (
     QWidget,
     QToolButton,
 )
-from PySide6.QtGui import QTextCursor
 
 from app.gcode_editor import GCodeEditor
 from app.project_tree import ProjectTreeWidget
-from app.viewer import GCodeViewer
-from core.import_pipeline import import_gcode_file, reparse_job
+from app.viewer import ALL_SEGMENTS, GCodeViewer
+from app.workers import ImportSignals, ImportTask, ReparseTask, start_process_imports
+from core.import_pipeline import ParsedSource, apply_parsed_source
+from core.lume_runtime import build_final_gcode_cached, remember_final_gcode
 from core.project_model import GCodeJob, Project
 from app.xyz_offset_dialog import XYZOffsetDialog
 
 
+# Parsing runs at ~5 MB/s, but unpickling a finished job in the GUI process
+# costs ~75% of parsing it again, and spawning the workers ~0.3 s. The pool
+# only comes out ahead once the batch takes seconds to parse; smaller
+# batches stay on the thread pool.
+_PROCESS_IMPORT_MIN_BYTES = 8 * 1024 * 1024
+
+
+def _total_file_size(paths: List[str]) -> int:
+    total = 0
+    for path_str in paths:
+        try:
+            total += Path(path_str).stat().st_size
+        except OSError:
+            # Missing/unreadable files are reported by the import itself
+            pass
+    return total
+
+
+@dataclass
+class _ImportBatch:
+    """Bookkeeping for one import running on the thread or process pool."""
+
+    token: int
+    paths: List[str]
+    progress: QProgressDialog
+    jobs: List[Optional[GCodeJob]] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+    remaining: int = 0
+    # Process-pool imports only: result signals and per-file futures
+    signals: Optional[ImportSignals] = None
+    futures: List[Future] = field(default_factory=list)
+
+
 class MainWindow(QMainWindow):
     """Main application window.
 
@@ -44,9 +83,32 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("CNC Softwire")
 
         self.project = Project(name="Untitled Project")
+        self.project.changed_callback = self._on_project_changed
         self.current_job: Optional[GCodeJob] = None
         self._is_top_view: bool = False
 
+        # Source line range last handled and the (job id, flat_segments span)
+        # last sent to the viewer; None forces a redraw.
+        self._last_highlight_range: Optional[Tuple[int, int]] = None
+        self._last_highlight_key: Optional[Tuple[str, int, int]] = None
+
+        # Editor cursor moves arrive in bursts (arrow keys, typing); the
+        # highlight is recomputed once the burst settles.
+        self._cursor_timer = QTimer(self)
+        self._cursor_timer.setSingleShot(True)
+        self._cursor_timer.setInterval(80)
+        self._cursor_timer.timeout.connect(self._do_highlight_from_cursor)
+
+        # Background reparses: job id -> (token, kind, new_source). Only the
+        # latest token per job is applied; kind is "edit" or "offsets".
+        self._pending_reparse: Dict[str, Tuple[int, str, str]] = {}
+        self._reparse_token: int = 0
+        self._import_token: int = 0
+        # Set while a coalesced viewer.set_project is queued (see
+        # _schedule_viewer_refresh).
+        self._viewer_dirty: bool = False
+        self._import_batch: Optional[_ImportBatch] = None
+
         self._create_viewer()
         self._create_project_tree_dock()
         self._create_gcode_editor_dock()
@@ -67,6 +129,7 @@ class MainWindow(QMainWindow):
 
         # Hooks from viewer
         self.viewer.cursor_moved_callback = self._on_view_cursor_moved
+        self.viewer.segment_picked_callback = self._on_segment_picked
 
     def _create_project_tree_dock(self) -> None:
         self.project_tree = ProjectTreeWidget(self)
@@ -117,6 +180,7 @@ class MainWindow(QMainWindow):
     def _create_status_bar(self) -> None:
         status = QStatusBar(self)
         self.setStatusBar(status)
+        self._status = status
         status.showMessage("Ready")
 
         # Live XY(Z) readout on the right, like FlatCAM's bottom bar
@@ -124,6 +188,22 @@ class MainWindow(QMainWindow):
         self.status_coord_label.setMinimumWidth(220)
         status.addPermanentWidget(self.status_coord_label)
 
+        # Mouse moves can arrive far faster than the screen refreshes; the
+        # label is updated at most once per ~16 ms with the latest position.
+        self._coord_fmt = "X: {:7.3f}    Y: {:7.3f}    Z: {:7.3f}".format
+        self._last_xyz: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self._coord_timer = QTimer(self)
+        self._coord_timer.setSingleShot(True)
+        self._coord_timer.setInterval(16)
+        self._coord_timer.timeout.connect(self._flush_coord_label)
+
+        # Busy indicator while a reparse runs on the thread pool
+        self.status_progress = QProgressBar(self)
+        self.status_progress.setRange(0, 0)
+        self.status_progress.setMaximumWidth(120)
+        self.status_progress.setVisible(False)
+        status.addPermanentWidget(self.status_progress)
+
     def _create_menu_bar(self) -> None:
         menu_bar = self.menuBar()
 
@@ -166,14 +246,21 @@ class MainWindow(QMainWindow):
     # ----------------------------------------------------------------- actions
 
     def _new_project(self) -> None:
+        # Jobs of a running import belong to the old project
+        self._cancel_import()
         self.project = Project(name="Untitled Project")
+        self.project.changed_callback = self._on_project_changed
         self.current_job = None
+        self._reset_highlight_memo()
+        self._viewer_dirty = False
+        self._pending_reparse.clear()
+        self.status_progress.setVisible(False)
         self.project_tree.set_project(self.project)
         self.gcode_editor.clear()
         self.viewer.set_project(self.project)
         self.apply_action.setEnabled(False)
         self.apply_button.setEnabled(False)
-        self.statusBar().showMessage("New project created", 3000)
+        self._status.showMessage("New project created", 3000)
 
     def _import_gcode_files(self) -> None:
         dialog = QFileDialog(self, "Import G-code files")
@@ -187,25 +274,101 @@ class MainWindow(QMainWindow):
         if not selected_paths:
             return
 
-        imported_count = 0
-        errors: list[str] = []
+        self._import_paths(selected_paths)
 
-        for path_str in selected_paths:
-            try:
-                path = Path(path_str)
-                job = import_gcode_file(path)
-                self.project.add_job(job)
-                imported_count += 1
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"{path_str}: {exc}")
+    def _import_paths(self, paths: List[str]) -> None:
+        """Parse files in parallel; jobs are added once the whole batch is done."""
+        if self._import_batch is not None:
+            QMessageBox.information(
+                self, "Import running", "Wait for the current import to finish."
+            )
+            return
 
-        self.project_tree.set_project(self.project)
-        self.viewer.set_project(self.project)
+        progress = QProgressDialog("Importing G-code...", "Cancel", 0, len(paths), self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(self._cancel_import)
+
+        self._import_token += 1
+        batch = _ImportBatch(
+            token=self._import_token,
+            paths=list(paths),
+            progress=progress,
+            jobs=[None] * len(paths),
+            remaining=len(paths),
+        )
+        self._import_batch = batch
+
+        if len(paths) > 1 and _total_file_size(paths) >= _PROCESS_IMPORT_MIN_BYTES:
+            # Several large files: parse in worker processes to use all cores
+            batch.signals = ImportSignals()
+            batch.signals.finished.connect(self._on_import_finished)
+            batch.signals.failed.connect(self._on_import_failed)
+            batch.futures = start_process_imports(
+                batch.token, [Path(p) for p in paths], batch.signals
+            )
+            return
+
+        pool = QThreadPool.globalInstance()
+        for index, path_str in enumerate(paths):
+            task = ImportTask(batch.token, index, Path(path_str))
+            task.signals.finished.connect(self._on_import_finished)
+            task.signals.failed.connect(self._on_import_failed)
+            pool.start(task)
+
+    def _on_import_finished(self, token: int, index: int, job: GCodeJob) -> None:
+        batch = self._import_batch
+        if batch is None or batch.token != token:
+            return
+        batch.jobs[index] = job
+        self._import_step(batch)
+
+    def _on_import_failed(self, token: int, index: int, message: str) -> None:
+        batch = self._import_batch
+        if batch is None or batch.token != token:
+            return
+        batch.errors[index] = f"{batch.paths[index]}: {message}"
+        self._import_step(batch)
+
+    def _cancel_import(self) -> None:
+        # Results of still-running tasks are ignored via the batch token
+        batch = self._import_batch
+        self._import_batch = None
+        if batch is not None:
+            # Files not yet picked up by a worker process are dropped
+            for future in batch.futures:
+                future.cancel()
+            # Also reached without the dialog's Cancel (New Project); closing
+            # emits canceled again, so disconnect first
+            batch.progress.canceled.disconnect(self._cancel_import)
+            batch.progress.close()
+            batch.progress.deleteLater()
+            self._status.showMessage("Import cancelled", 3000)
+
+    def _import_step(self, batch: _ImportBatch) -> None:
+        batch.remaining -= 1
+        if batch.remaining > 0:
+            # A modal progress dialog processes events in setValue, so the
+            # next result may re-enter here; only the last one finishes.
+            batch.progress.setValue(len(batch.paths) - batch.remaining)
+            return
 
-        if imported_count:
-            self.statusBar().showMessage(f"Imported {imported_count} file(s).", 5000)
+        self._import_batch = None
+        batch.progress.canceled.disconnect(self._cancel_import)
+        batch.progress.close()
+        batch.progress.deleteLater()
 
-        if errors:
+        # Add in selection order; tree + viewer refresh once on exit
+        jobs = [job for job in batch.jobs if job is not None]
+        with self.project.block_updates():
+            for job in jobs:
+                self.project.add_job(job)
+
+        if jobs:
+            self._status.showMessage(f"Imported {len(jobs)} file(s).", 5000)
+
+        if batch.errors:
+            errors = [batch.errors[i] for i in sorted(batch.errors)]
             QMessageBox.warning(
                 self,
                 "Import errors",
@@ -221,82 +384,225 @@ class MainWindow(QMainWindow):
             )
             return
 
-        new_source = self.gcode_editor.toPlainText()
-        try:
-            reparse_job(self.current_job, new_source)
-        except Exception as exc:  # noqa: BLE001
+        job = self.current_job
+        new_source = self.gcode_editor.source_text()
+        if job.id not in self._pending_reparse and new_source == job.original_source:
+            # Nothing changed since the last parse (str == checks length first)
+            self._status.showMessage("No changes to apply", 3000)
+            return
+        self._start_reparse(job, new_source, "edit")
+
+    def _start_reparse(self, job: GCodeJob, new_source: str, kind: str) -> None:
+        """Parse `new_source` on the thread pool; the job is updated on completion."""
+        self._reparse_token += 1
+        token = self._reparse_token
+        self._pending_reparse[job.id] = (token, kind, new_source)
+
+        task = ReparseTask(job.id, token, new_source)
+        task.signals.finished.connect(self._on_reparse_finished)
+        task.signals.failed.connect(self._on_reparse_failed)
+        QThreadPool.globalInstance().start(task)
+
+        self._update_reparse_state()
+        self._status.showMessage(f"Parsing {job.name}...")
+
+    def _take_pending_reparse(self, job_id: str, token: int) -> Optional[Tuple[str, str]]:
+        """Pop the pending entry for a finished task; None if it went stale."""
+        entry = self._pending_reparse.get(job_id)
+        if entry is None or entry[0] != token:
+            return None
+        del self._pending_reparse[job_id]
+        self._update_reparse_state()
+        return entry[1], entry[2]
+
+    def _on_reparse_finished(self, job_id: str, token: int, parsed: ParsedSource) -> None:
+        entry = self._take_pending_reparse(job_id, token)
+        job = self.project.get_job_by_id(job_id)
+        if entry is None or job is None:
+            return
+        kind, new_source = entry
+
+        apply_parsed_source(job, new_source, parsed)
+        if kind == "offsets":
+            remember_final_gcode(job, new_source)
+        self.viewer.update_job(job)
+
+        if self.current_job is job:
+            # update_job dropped the overlay; allow it to be redrawn
+            self._reset_highlight_memo()
+            # Refresh editor text so the new G92/header/footer are visible;
+            # set_job loads it in chunks and wraps long lines, and
+            # remember_final_gcode makes it show `new_source` as is
+            if kind == "offsets":
+                self.gcode_editor.set_job(job)
+            self._do_highlight_from_cursor()
+
+        if kind == "offsets":
+            self._status.showMessage(f"Offsets applied to {job.name}", 3000)
+        else:
+            self._status.showMessage("G-code updated from editor", 3000)
+
+    def _on_reparse_failed(self, job_id: str, token: int, message: str) -> None:
+        entry = self._take_pending_reparse(job_id, token)
+        if entry is None:
+            return
+        self._status.clearMessage()
+        if entry[0] == "offsets":
+            QMessageBox.warning(
+                self,
+                "Offset error",
+                f"Could not apply offsets to G-code:\n{message}",
+            )
+        else:
             QMessageBox.warning(
                 self,
                 "Parse error",
-                f"Could not parse G-code for this job:\n{exc}",
+                f"Could not parse G-code for this job:\n{message}",
             )
-            return
 
-        self.viewer.set_project(self.project)
-        self.statusBar().showMessage("G-code updated from editor", 3000)
+    def _update_reparse_state(self) -> None:
+        """Show the busy indicator and lock edits of a job that is being reparsed."""
+        self.status_progress.setVisible(bool(self._pending_reparse))
+        job = self.current_job
+        enabled = job is not None and job.id not in self._pending_reparse
+        self.apply_action.setEnabled(enabled)
+        self.apply_button.setEnabled(enabled)
+        self.offset_button.setEnabled(enabled)
 
     # ----------------------------------------------------------------- callbacks
 
+    def _on_project_changed(self) -> None:
+        self.project_tree.set_project(self.project)
+        self._schedule_viewer_refresh()
+
+    def _schedule_viewer_refresh(self) -> None:
+        """Queue one viewer rebuild for however many changes happen this tick."""
+        if not self._viewer_dirty:
+            self._viewer_dirty = True
+            QTimer.singleShot(0, self._flush_viewer_refresh)
+
+    def _flush_viewer_refresh(self) -> None:
+        if not self._viewer_dirty:
+            return
+        self._viewer_dirty = False
+        # set_project rebuilds the scene, dropping the highlight overlay
+        self.viewer.set_project(self.project)
+        self._reset_highlight_memo()
+
     def _on_job_selected(self, job: Optional[GCodeJob]) -> None:
         self.current_job = job
+        self._reset_highlight_memo()
 
         if job is None:
             self.gcode_editor.clear()
             self.apply_action.setEnabled(False)
             self.apply_button.setEnabled(False)
             self.offset_button.setEnabled(False)
-            self.statusBar().showMessage("No job selected", 3000)
+            self._status.showMessage("No job selected", 3000)
             return
 
         self.gcode_editor.set_job(job)
-        self.apply_action.setEnabled(True)
-        self.apply_button.setEnabled(True)
-        self.offset_button.setEnabled(True)
-        self.statusBar().showMessage(f"Selected job: {job.name}", 3000)
+        self._do_highlight_from_cursor()
+        self._update_reparse_state()
+        self._status.showMessage(f"Selected job: {job.name}", 3000)
 
     def _on_editor_cursor_changed(self) -> None:
+        # (Re)start the debounce countdown; the actual work happens once
+        # the cursor has been still for the timer interval.
+        self._cursor_timer.start()
+
+    def _do_highlight_from_cursor(self) -> None:
         if self.current_job is None or self.current_job.program_index is None:
             return
 
+        # selectionStart/End equal position() when nothing is selected
         cursor = self.gcode_editor.textCursor()
+        doc = self.gcode_editor.document()
+        start_block = doc.findBlock(cursor.selectionStart()).blockNumber()
+        end_block = doc.findBlock(cursor.selectionEnd()).blockNumber()
 
-        sc = QTextCursor(self.gcode_editor.document())
-        ec = QTextCursor(self.gcode_editor.document())
-
-        if cursor.hasSelection():
-            sc.setPosition(cursor.selectionStart())
-            ec.setPosition(cursor.selectionEnd())
-        else:
-            sc.setPosition(cursor.position())
-            ec.setPosition(cursor.position())
-
-        start_line = sc.blockNumber() + 1
-        end_line = ec.blockNumber() + 1
+        start_line = self.gcode_editor.source_line(start_block)
+        end_line = self.gcode_editor.source_line(end_block)
         if end_line < start_line:
             start_line, end_line = end_line, start_line
 
-        program = self.current_job.program
-        stmt_indices = [
-            idx
-            for idx, stmt in enumerate(program.statements)
-            if start_line <= stmt.line_number <= end_line
-        ]
+        # Most cursor moves stay within the same line(s)
+        if self._last_highlight_range == (start_line, end_line):
+            return
+        self._last_highlight_range = (start_line, end_line)
 
-        segment_indices: list[int] = []
-        idx_map = self.current_job.program_index.statement_to_segments
-        for si in stmt_indices:
-            segment_indices.extend(idx_map.get(si, []))
+        job = self.current_job
+        index = job.program_index
+        line_numbers = index.line_numbers
+        if line_numbers is None:
+            return
+        if len(line_numbers) and start_line <= line_numbers[0] and end_line >= line_numbers[-1]:
+            # Whole program selected (Ctrl+A): no lookup, no gather
+            begin, end = 0, len(index.flat_segments)
+            segment_indices = ALL_SEGMENTS
+        else:
+            begin, end = index.segment_span_for_lines(start_line, end_line)
+            if index.segments_in_order:
+                # Segment range: the viewer slices its vertex array, no gather
+                segment_indices = slice(begin, end)
+            else:
+                segment_indices = index.flat_segments[begin:end]
+
+        # CSR slices are contiguous, so the span identifies the segment set;
+        # e.g. moving between comment lines keeps the same (empty) set.
+        key = (job.id, begin, end) if end > begin else (job.id, 0, 0)
+        if key == self._last_highlight_key:
+            return
+        self._last_highlight_key = key
 
-        self.viewer.highlight_segments(self.current_job, segment_indices)
+        self.viewer.highlight_segments(job, segment_indices)
 
-    def _on_visibility_changed(self) -> None:
-        self.viewer.set_project(self.project)
+    def _reset_highlight_memo(self) -> None:
+        self._last_highlight_range = None
+        self._last_highlight_key = None
+
+    def _on_visibility_changed(self, job: GCodeJob, visible: bool) -> None:
+        self.viewer.set_job_visible(job, visible)
 
     # -------------------- viewer �+' mainwindow hooks -------------------
 
     def _on_view_cursor_moved(self, x: float, y: float, z: float) -> None:
         """Update status bar with current crosshair position (always XY plane)."""
-        self.status_coord_label.setText(f"X: {x:7.3f}    Y: {y:7.3f}    Z: {z:7.3f}")
+        self._last_xyz = (x, y, z)
+        # Unlike the editor debounce, don't restart: flush at a steady rate
+        if not self._coord_timer.isActive():
+            self._coord_timer.start()
+
+    def _on_segment_picked(self, job: GCodeJob, segment_index: int) -> None:
+        """Reverse pick: select the job and the editor line of the segment."""
+        index = job.program_index
+        if index is None or index.line_numbers is None:
+            return
+        stmt_index = index.statement_for_segment(segment_index)
+        if stmt_index is None:
+            return
+
+        if job is not self.current_job:
+            self.project_tree.select_job(job)
+            if job is not self.current_job:
+                return
+
+        editor = self.gcode_editor
+        block_number = editor.block_for_source_line(int(index.line_numbers[stmt_index]))
+        if block_number >= editor.blockCount():
+            editor.finish_pending_load()
+        block = editor.document().findBlockByNumber(block_number)
+        if not block.isValid():
+            return
+        # Select the line; the cursor handler then highlights its segments
+        cursor = editor.textCursor()
+        cursor.setPosition(block.position())
+        cursor.setPosition(block.position() + block.length() - 1, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.centerCursor()
+
+    def _flush_coord_label(self) -> None:
+        self.status_coord_label.setText(self._coord_fmt(*self._last_xyz))
 
     # -------------------------- offsets dialog ------------------------
 
@@ -327,27 +633,11 @@ class MainWindow(QMainWindow):
             job.offset_z = oz
 
             # Rebuild final Lume G-code with new offsets and make it canonical
-            from core.lume_runtime import build_final_gcode
-
-            new_source = build_final_gcode(job)
-            try:
-                # Update job model + geometry (database + plot)
-                reparse_job(job, new_source)
-            except Exception as exc:  # noqa: BLE001
-                QMessageBox.warning(
-                    self,
-                    "Offset error",
-                    f"Could not apply offsets to G-code:\n{exc}",
-                )
-                return
-
-            # Refresh editor text so the new G92/header/footer are visible
-            if self.current_job is job:
-                self.gcode_editor.setPlainText(new_source)
+            new_source = build_final_gcode_cached(job)
+            # Update job model + geometry (database + plot) in the background
+            self._start_reparse(job, new_source, "offsets")
 
     # -------------------------- final G-code helper --------------------
 
     def get_final_gcode_for_job(self, job: GCodeJob) -> str:
-        from core.lume_runtime import build_final_gcode
-
-        return build_final_gcode(job)
+        return build_final_gcode_cached(job)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
@@ -8,17 +8,33 @@ from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
 from core.project_model import Project, GCodeJob
 
 
+class JobTreeItem(QTreeWidgetItem):
+    """Tree row for one GCodeJob; the id is a plain Python attribute.
+
+    Reading `job_id` avoids the QVariant round trip of item.data(). The id
+    is also stored under Qt.UserRole for code that still reads it there.
+    """
+
+    def __init__(self, job: GCodeJob) -> None:
+        super().__init__([job.display_name()])
+        self.job_id: str = job.id
+
+
 class ProjectTreeWidget(QTreeWidget):
     """FlatCAM-style project tree with visibility checkboxes."""
 
     job_selected_callback: Optional[Callable[[Optional[GCodeJob]], None]]
-    visibility_changed_callback: Optional[Callable[[], None]]
+    visibility_changed_callback: Optional[Callable[[GCodeJob, bool], None]]
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setHeaderHidden(True)
         self.project: Optional[Project] = None
         self.jobs_root_item: Optional[QTreeWidgetItem] = None
+        self._items_by_job_id: Dict[str, JobTreeItem] = {}
+        # True while the tree mirrors the project; item edits made then are
+        # not user visibility toggles.
+        self._updating: bool = False
         self.job_selected_callback = None
         self.visibility_changed_callback = None
 
@@ -28,13 +44,36 @@ class ProjectTreeWidget(QTreeWidget):
     # --------------------------------------------------------------------- API
 
     def set_project(self, project: Project) -> None:
+        """Show `project`; the same project again is synced incrementally."""
+        if project is self.project and self.jobs_root_item is not None:
+            self._sync_tree()
+            return
         self.project = project
         self._rebuild_tree()
 
+    def item_for_job_id(self, job_id: str) -> Optional[JobTreeItem]:
+        """Tree item showing the job `job_id`, or None if it is not listed."""
+        return self._items_by_job_id.get(job_id)
+
+    def select_job(self, job: Optional[GCodeJob]) -> None:
+        """Make `job`'s row current (fires job_selected_callback)."""
+        item = self.item_for_job_id(job.id) if job is not None else None
+        if item is not None:
+            self.setCurrentItem(item)
+
     # ----------------------------------------------------------------- helpers
 
     def _rebuild_tree(self) -> None:
+        self._updating = True
+        try:
+            self._fill_tree()
+        finally:
+            self._updating = False
+
+    def _fill_tree(self) -> None:
         self.clear()
+        self._items_by_job_id.clear()
+        self.jobs_root_item = None
         if self.project is None:
             return
 
@@ -45,18 +84,62 @@ class ProjectTreeWidget(QTreeWidget):
         project_root.addChild(jobs_root)
         self.jobs_root_item = jobs_root
 
-        for job in self.project.jobs:
-            item = QTreeWidgetItem([job.display_name()])
-            flags = item.flags()
-            flags |= Qt.ItemIsUserCheckable | Qt.ItemIsSelectable | Qt.ItemIsEnabled
-            item.setFlags(flags)
-            item.setCheckState(0, Qt.Checked if job.visible else Qt.Unchecked)
-            item.setData(0, Qt.UserRole, job.id)
-            jobs_root.addChild(item)
+        # Items are filled in before being attached, so no itemChanged fires
+        jobs_root.addChildren([self._create_job_item(job) for job in self.project.jobs])
 
         project_root.setExpanded(True)
         jobs_root.setExpanded(True)
 
+    def _create_job_item(self, job: GCodeJob) -> JobTreeItem:
+        item = JobTreeItem(job)
+        flags = item.flags()
+        flags |= Qt.ItemIsUserCheckable | Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        item.setFlags(flags)
+        item.setCheckState(0, Qt.Checked if job.visible else Qt.Unchecked)
+        item.setData(0, Qt.UserRole, job.id)
+        self._items_by_job_id[job.id] = item
+        return item
+
+    def _sync_tree(self) -> None:
+        """Diff the tree against project.jobs by id: O(changed jobs) item work.
+
+        Keeps selection, expansion and scroll position, unlike a rebuild.
+        """
+        project = self.project
+        jobs_root = self.jobs_root_item
+        if project is None or jobs_root is None:
+            return
+
+        # Not QSignalBlocker: removing the selected job must still reach
+        # job_selected_callback; _on_item_changed skips while _updating.
+        self._updating = True
+        try:
+            project_root = jobs_root.parent()
+            if project_root is not None and project_root.text(0) != project.name:
+                project_root.setText(0, project.name)
+
+            job_ids = {job.id for job in project.jobs}
+            for job_id in [jid for jid in self._items_by_job_id if jid not in job_ids]:
+                item = self._items_by_job_id.pop(job_id)
+                jobs_root.removeChild(item)
+
+            for row, job in enumerate(project.jobs):
+                item = self._items_by_job_id.get(job.id)
+                if item is None:
+                    jobs_root.insertChild(row, self._create_job_item(job))
+                    continue
+                if jobs_root.indexOfChild(item) != row:
+                    jobs_root.takeChild(jobs_root.indexOfChild(item))
+                    jobs_root.insertChild(row, item)
+                name = job.display_name()
+                if item.text(0) != name:
+                    item.setText(0, name)
+                state = Qt.Checked if job.visible else Qt.Unchecked
+                if item.checkState(0) != state:
+                    item.setCheckState(0, state)
+        finally:
+            self._updating = False
+
     def _on_selection_changed(self) -> None:
         if self.project is None:
             return
@@ -68,7 +151,7 @@ class ProjectTreeWidget(QTreeWidget):
             return
 
         item = selected_items[0]
-        job_id = item.data(0, Qt.UserRole)
+        job_id = getattr(item, "job_id", None)
         if job_id is None:
             if self.job_selected_callback:
                 self.job_selected_callback(None)
@@ -79,10 +162,10 @@ class ProjectTreeWidget(QTreeWidget):
             self.job_selected_callback(job)
 
     def _on_item_changed(self, item: QTreeWidgetItem, column: int) -> None:
-        if self.project is None:
+        if self.project is None or self._updating:
             return
 
-        job_id = item.data(0, Qt.UserRole)
+        job_id = getattr(item, "job_id", None)
         if job_id is None:
             return
 
@@ -90,6 +173,9 @@ class ProjectTreeWidget(QTreeWidget):
         if job is None:
             return
 
-        job.visible = item.checkState(0) == Qt.Checked
+        visible = item.checkState(0) == Qt.Checked
+        if visible == job.visible:
+            return
+        job.visible = visible
         if self.visibility_changed_callback:
-            self.visibility_changed_callback()
+            self.visibility_changed_callback(job, visible)
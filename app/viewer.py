@@ -1,30 +1,40 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Optional, Sequence, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import bisect
 import math
+
 import numpy as np
 import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 from pyqtgraph.opengl import GLGraphicsItem, GLScatterPlotItem
-from PySide6.QtCore import Qt, QEvent
+from PySide6.QtCore import Qt, QEvent, QTimer
 from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
-from OpenGL.GL import (
-    glGetDoublev,
-    glGetIntegerv,
-    GL_MODELVIEW_MATRIX,
-    GL_PROJECTION_MATRIX,
-    GL_VIEWPORT,
-)
-from OpenGL.GLU import gluUnProject
 
+from core.geometry_builder import ToolpathGeometry
 from core.project_model import GCodeJob, Project
 
 CursorCallback = Callable[[float, float, float], None]
 SegmentCallback = Callable[[GCodeJob, int], None]
 
+# highlight_segments sentinel: every segment of the job (e.g. Ctrl+A)
+ALL_SEGMENTS = slice(None)
+
+# Grid step for a target spacing: 1/2/5 per decade, switching at 1.5x and
+# 3.5x the decade base, clamped to 0.01..50. Targets below
+# _GRID_THRESHOLDS[i] (and above the previous one) get _GRID_STEPS[i].
+_GRID_THRESHOLDS = [t * 10.0**k for k in range(-2, 2) for t in (1.5, 3.5, 10.0)]
+_GRID_STEPS = [s * 10.0**k for k in range(-2, 2) for s in (1.0, 2.0, 5.0)] + [50.0]
+
+# Level-of-detail for the scene item: level k keeps about one toolpath
+# vertex in _LOD_FACTORS[k]. A coarser level is only used when the segments
+# in view would exceed _LOD_TARGET_SEGMENTS.
+_LOD_FACTORS = (1, 4, 16, 64)
+_LOD_TARGET_SEGMENTS = 200_000
+
 
 class GCodeViewer(QWidget):
     """NC-style 3D viewer based on pyqtgraph's GLViewWidget.
@@ -73,20 +83,98 @@ class GCodeViewer(QWidget):
         self._grid_spacing: Tuple[float, float] = (10.0, 10.0)
 
         # Origin axes (X red, Y green, Z blue)
-        self._axes: list[GLGraphicsItem] = []
+        self._axes: Optional[GLGraphicsItem] = None
         self._add_axes()
 
         self._project: Optional[Project] = None
-        self._job_items: Dict[str, GLGraphicsItem] = {}
-        self._highlight_item: Optional[GLGraphicsItem] = None
-        self._highlight_points: Optional[GLScatterPlotItem] = None
-        self._head_marker: Optional[GLScatterPlotItem] = None  # simulation head
+        # All jobs are drawn by one line item (one draw call) with per-vertex
+        # colours; remembering which cached arrays it holds lets rebuilds
+        # that change nothing skip the concatenate + upload. Hidden jobs stay
+        # in the buffer with alpha 0 (the item blends additively), so a
+        # visibility toggle only rewrites the alpha of that job's range.
+        self._scene_item = gl.GLLinePlotItem(
+            pos=np.zeros((2, 3), dtype=np.float32), mode="lines"
+        )
+        self._scene_item.setVisible(False)
+        self.view.addItem(self._scene_item)
+        self._scene_parts: List[Tuple[str, np.ndarray]] = []
+        # Job id -> (first vertex, vertex count) in the merged buffer, and
+        # whether that range is currently drawn (alpha > 0)
+        self._scene_ranges: Dict[str, Tuple[int, int]] = {}
+        self._scene_shown: Dict[str, bool] = {}
+        # Per-vertex RGBA of the merged buffer; None for a single job, which
+        # is drawn from its own array with one uniform colour.
+        self._scene_colors: Optional[np.ndarray] = None
+        # Full-resolution parts the segment count / extent below belong to
+        self._scene_full_parts: List[Tuple[str, np.ndarray]] = []
+        self._scene_segments: int = 0
+        self._scene_extent: float = 0.0
+        # Decimated vertex arrays per job, index = LOD level (level 0 unused)
+        self._job_lods: Dict[str, List[Optional[np.ndarray]]] = {}
+        # Per-job (2 * n_segments, 3) float32 vertices, segment i = rows 2i, 2i+1
+        self._job_positions: Dict[str, np.ndarray] = {}
+        # Geometry object each cached vertex array was built from;
+        # a reparse swaps job.geometry, which invalidates the cache entry.
+        self._job_geometry: Dict[str, ToolpathGeometry] = {}
+        # Overlays are created once and updated with setData / setVisible,
+        # so a highlight or simulation step never allocates a new GL item.
+        # Higher depth values are drawn after (on top of) the job lines.
+        self._highlight_item = gl.GLLinePlotItem(
+            pos=np.zeros((2, 3), dtype=np.float32),
+            mode="lines",
+            color=(1.0, 1.0, 0.0, 1.0),
+            width=3.0,
+        )
+        self._highlight_points = GLScatterPlotItem(
+            pos=np.zeros((1, 3), dtype=np.float32),
+            size=5.0,
+            color=(1.0, 1.0, 0.0, 1.0),
+            pxMode=True,
+        )
+        self._head_marker = GLScatterPlotItem(  # simulation head
+            pos=np.zeros((1, 3), dtype=np.float32),
+            size=8.0,
+            color=(0.0, 1.0, 1.0, 1.0),
+            pxMode=True,
+        )
+        for depth, overlay in enumerate(
+            (self._highlight_item, self._highlight_points, self._head_marker), start=1
+        ):
+            overlay.setDepthValue(depth)
+            overlay.setVisible(False)
+            self.view.addItem(overlay)
+        # Reused gather buffer for highlight vertices, grown geometrically
+        self._hl_buf = np.empty((0, 3), dtype=np.float32)
+        self._highlight_shown: bool = False
+        self._head_shown: bool = False
+        # Job whose segments the highlight / head marker currently refer to
+        self._overlay_job_id: Optional[str] = None
 
         # Callback to MainWindow for XY(Z) readout
         self.cursor_moved_callback: Optional[CursorCallback] = None
+        # Callback to MainWindow for right-click reverse pick (job, segment)
+        self.segment_picked_callback: Optional[SegmentCallback] = None
 
         # Picking radius in model units (mm); updated with zoom/grid
-        self._pick_radius: float = 1.0
+        self._pick_radius: float = self._grid_spacing[0] * 0.5
+
+        # (camera key, inverse model-view-projection, viewport) for cursor
+        # unprojection; recomputed only when the camera or size changes.
+        self._gl_matrices: Optional[Tuple[tuple, np.ndarray, np.ndarray]] = None
+
+        # Mouse moves (up to ~1 kHz) and wheel ticks are coalesced to about
+        # one update per frame; only the latest mouse position is unprojected.
+        self._pending_mouse_pos: Optional[Tuple[float, float]] = None
+        # Last snapped readout sent to cursor_moved_callback
+        self._last_cursor: Optional[Tuple[float, float, float]] = None
+        self._cursor_timer = QTimer(self)
+        self._cursor_timer.setSingleShot(True)
+        self._cursor_timer.setInterval(16)
+        self._cursor_timer.timeout.connect(self._emit_cursor)
+        self._grid_timer = QTimer(self)
+        self._grid_timer.setSingleShot(True)
+        self._grid_timer.setInterval(16)
+        self._grid_timer.timeout.connect(self._on_zoom_changed)
 
         # See mouse move events even with no buttons pressed
         self.view.setMouseTracking(True)
@@ -100,56 +188,80 @@ class GCodeViewer(QWidget):
     # ----------------------------------------------------------------- public API
 
     def set_project(self, project: Project) -> None:
-        """Set current project and rebuild all job line plots."""
+        """Set current project and redraw its jobs."""
         self._project = project
         self._rebuild_scene()
 
+    def set_job_visible(self, job: GCodeJob, visible: bool) -> None:
+        """Show/hide an already-built job without touching its geometry.
+
+        Only the alpha of the job's vertex range in the merged scene buffer
+        is rewritten (no concatenate, no position upload); the job's
+        highlight and head marker follow its visibility.
+        """
+        if self._overlay_job_id == job.id:
+            self._highlight_item.setVisible(visible and self._highlight_shown)
+            self._highlight_points.setVisible(visible and self._highlight_shown)
+            self._head_marker.setVisible(visible and self._head_shown)
+
+        if job.id in self._scene_ranges:
+            self._sync_scene_visibility()
+        else:
+            # Not in the buffer yet (no geometry built so far)
+            self._update_scene_item()
+
+    def update_job(self, job: GCodeJob) -> None:
+        """Redraw a single job (e.g. after reparse).
+
+        Other jobs keep their cached vertices, and overlays are only
+        dropped when they belong to this job.
+        """
+        self.invalidate_job(job.id)
+        self._update_scene_item()
+
+    def invalidate_job(self, job_id: str) -> None:
+        """Drop the cached vertices of a job whose geometry changed."""
+        self._job_positions.pop(job_id, None)
+        self._job_geometry.pop(job_id, None)
+        self._job_lods.pop(job_id, None)
+        if self._overlay_job_id == job_id:
+            self._clear_overlays()
+
     def set_top_view(self) -> None:
         """Convenience: look straight down on XY plane."""
         # Elevation 90 => top-down; azimuth 0 aligns X to the right
         # and Y upwards in the 2D projection (screen space).
         self.view.setCameraPosition(elevation=90, azimuth=270)
-        self._update_grid_spacing()
+        self._on_zoom_changed()
 
     def set_iso_view(self) -> None:
         """Set camera to an isometric view from (-, -, +) quadrant."""
         # Azimuth ~225deg looks from negative X/negative Y towards origin.
         self.view.setCameraPosition(elevation=35, azimuth=225)
-        self._update_grid_spacing()
+        self._on_zoom_changed()
 
     def zoom_to_fit(self) -> None:
         """Zoom camera so all visible geometry fits the view."""
         if self._project is None:
             return
 
-        has_geometry = False
-        min_x = min_y = min_z = float("inf")
-        max_x = max_y = max_z = float("-inf")
-
+        lo: Optional[np.ndarray] = None
+        hi: Optional[np.ndarray] = None
         for job in self._project.jobs:
-            if not job.visible or job.geometry is None:
+            if not job.visible:
                 continue
-            segments = job.geometry.segments
-            if not segments:
+            pos = self._job_positions_for(job)
+            if pos is None or len(pos) == 0:
                 continue
-            has_geometry = True
-            for seg in segments:
-                for (x, y, z) in (seg.start, seg.end):
-                    if x < min_x:
-                        min_x = x
-                    if y < min_y:
-                        min_y = y
-                    if z < min_z:
-                        min_z = z
-                    if x > max_x:
-                        max_x = x
-                    if y > max_y:
-                        max_y = y
-                    if z > max_z:
-                        max_z = z
-
-        if not has_geometry:
+            job_lo = pos.min(axis=0)
+            job_hi = pos.max(axis=0)
+            lo = job_lo if lo is None else np.minimum(lo, job_lo)
+            hi = job_hi if hi is None else np.maximum(hi, job_hi)
+
+        if lo is None or hi is None:
             return
+        min_x, min_y, min_z = (float(v) for v in lo)
+        max_x, max_y, max_z = (float(v) for v in hi)
 
         cx = (min_x + max_x) * 0.5
         cy = (min_y + max_y) * 0.5
@@ -166,99 +278,79 @@ class GCodeViewer(QWidget):
         # Factor chosen empirically to keep geometry comfortably in view.
         distance = max(radius * 3.0, 50.0)
         self.view.setCameraPosition(distance=distance)
-        self._update_grid_spacing()
-
-    def highlight_segments(self, job: GCodeJob, segment_indices: Sequence[int]) -> None:
-        """Highlight specific segments for a job."""
+        self._on_zoom_changed()
+
+    def highlight_segments(
+        self, job: GCodeJob, segment_indices: Union[np.ndarray, slice]
+    ) -> None:
+        """Highlight specific segments for a job.
+
+        `segment_indices` is either an int32 array (e.g. a ProgramIndex CSR
+        slice), whose endpoints are gathered from the job's cached vertex
+        array, or a slice of segment numbers (ALL_SEGMENTS for everything),
+        which is shown as a view of that array without copying.
+        """
         # Clear previous highlight
-        if self._highlight_item is not None:
-            self.view.removeItem(self._highlight_item)
-            self._highlight_item = None
-        if self._highlight_points is not None:
-            self.view.removeItem(self._highlight_points)
-            self._highlight_points = None
-
-        if job.geometry is None or not segment_indices:
-            return
+        self._hide_highlight()
 
-        pts = []
-        point_pts = []
-        segments = job.geometry.segments
-        for idx in segment_indices:
-            if 0 <= idx < len(segments):
-                seg = segments[idx]
-                x0, y0, z0 = seg.start
-                x1, y1, z1 = seg.end
-                pts.append([x0, y0, z0])
-                pts.append([x1, y1, z1])
-                point_pts.append([x0, y0, z0])
-                point_pts.append([x1, y1, z1])
-
-        if not pts:
+        if job.geometry is None:
+            return
+        if not isinstance(segment_indices, slice) and len(segment_indices) == 0:
             return
+        self._overlay_job_id = job.id
 
-        pos = np.array(pts, dtype=float)
-        line_item = gl.GLLinePlotItem(
-            pos=pos,
-            mode="lines",
-            color=(1.0, 1.0, 0.0, 1.0),
-            width=3.0,
-        )
-        self.view.addItem(line_item)
-        self._highlight_item = line_item
-
-        if point_pts:
-            ppos = np.array(point_pts, dtype=float)
-            scatter = GLScatterPlotItem(
-                pos=ppos,
-                size=5.0,
-                color=(1.0, 1.0, 0.0, 1.0),
-                pxMode=True,
-            )
-            self.view.addItem(scatter)
-            self._highlight_points = scatter
+        job_pos = self._job_positions_for(job)
+        if job_pos is None:
+            return
+        seg_pos = job_pos.reshape(-1, 2, 3)
+        if isinstance(segment_indices, slice):
+            start, stop, step = segment_indices.indices(len(seg_pos))
+            if stop <= start:
+                return
+            if step == 1:
+                pos = job_pos[2 * start : 2 * stop]
+            else:
+                pos = self._gather_segments(seg_pos, np.arange(start, stop, step))
+        else:
+            idx = np.asarray(segment_indices, dtype=np.int32)
+            idx = idx[(idx >= 0) & (idx < len(seg_pos))]
+            if len(idx) == 0:
+                return
+            pos = self._gather_segments(seg_pos, idx)
+        self._highlight_item.setData(pos=pos)
+        self._highlight_points.setData(pos=pos)
+        self._highlight_shown = True
+        self._highlight_item.setVisible(job.visible)
+        self._highlight_points.setVisible(job.visible)
 
     def reset_simulation_head(self) -> None:
-        """Remove the simulation head marker."""
-        if self._head_marker is not None:
-            self.view.removeItem(self._head_marker)
-            self._head_marker = None
+        """Hide the simulation head marker."""
+        self._head_shown = False
+        self._head_marker.setVisible(False)
 
     def update_simulation_head(self, job: GCodeJob, stmt_index: int) -> None:
         """Highlight segments for a program line and show a head marker."""
         if job.geometry is None or job.program_index is None:
             return
 
-        idx_map = job.program_index.statement_to_segments
-        seg_indices = idx_map.get(stmt_index, [])
+        seg_indices = job.program_index.segments_for_statement(stmt_index)
         self.highlight_segments(job, seg_indices)
 
-        if not seg_indices:
+        job_pos = self._job_positions_for(job)
+        if len(seg_indices) == 0 or job_pos is None:
             self.reset_simulation_head()
             return
 
-        segments = job.geometry.segments
-        last_idx = seg_indices[-1]
-        if not (0 <= last_idx < len(segments)):
+        last_idx = int(seg_indices[-1])
+        if not (0 <= last_idx < len(job_pos) // 2):
             self.reset_simulation_head()
             return
 
-        seg = segments[last_idx]
-        hx, hy, hz = seg.end
-
-        if self._head_marker is not None:
-            self.view.removeItem(self._head_marker)
-            self._head_marker = None
-
-        pos = np.array([[hx, hy, hz]], dtype=float)
-        marker = GLScatterPlotItem(
-            pos=pos,
-            size=8.0,
-            color=(0.0, 1.0, 1.0, 1.0),
-            pxMode=True,
-        )
-        self.view.addItem(marker)
-        self._head_marker = marker
+        # End point of the statement's last segment
+        end = 2 * last_idx + 1
+        self._head_marker.setData(pos=job_pos[end : end + 1])
+        self._head_shown = True
+        self._head_marker.setVisible(job.visible)
 
     # ----------------------------------------------------------------- event filter
 
@@ -273,82 +365,226 @@ class GCodeViewer(QWidget):
             if et == QEvent.Wheel:
                 # Let GLViewWidget handle zoom, then adjust grid spacing
                 self.view.wheelEvent(ev)
-                self._update_grid_spacing()
+                if not self._grid_timer.isActive():
+                    self._grid_timer.start()
                 return True
+            if (
+                et == QEvent.MouseButtonPress
+                and isinstance(ev, QMouseEvent)
+                and ev.button() == Qt.RightButton
+            ):
+                # Reverse pick, then let GLViewWidget see the press as usual
+                self._pick_from_mouse(ev)
         return super().eventFilter(obj, ev)
 
     # ----------------------------------------------------------------- internals
 
     def _add_axes(self) -> None:
-        for ax in self._axes:
-            self.view.removeItem(ax)
-        self._axes.clear()
-
-        # X axis (red)
-        x_pos = np.array([[0, 0, 0], [50, 0, 0]], dtype=float)
-        x_axis = gl.GLLinePlotItem(pos=x_pos, mode="lines", color=(1.0, 0.0, 0.0, 1.0), width=2.0)
-        self.view.addItem(x_axis)
-        self._axes.append(x_axis)
-
-        # Y axis (green)
-        y_pos = np.array([[0, 0, 0], [0, 50, 0]], dtype=float)
-        y_axis = gl.GLLinePlotItem(pos=y_pos, mode="lines", color=(0.0, 1.0, 0.0, 1.0), width=2.0)
-        self.view.addItem(y_axis)
-        self._axes.append(y_axis)
-
-        # Z axis (blue)
-        z_pos = np.array([[0, 0, 0], [0, 0, 10]], dtype=float)
-        z_axis = gl.GLLinePlotItem(pos=z_pos, mode="lines", color=(0.0, 0.4, 1.0, 1.0), width=2.0)
-        self.view.addItem(z_axis)
-        self._axes.append(z_axis)
+        if self._axes is not None:
+            self.view.removeItem(self._axes)
+
+        # X (red), Y (green), Z (blue) as one 6-vertex line item: one draw
+        # call, colours per vertex.
+        pos = np.array(
+            [[0, 0, 0], [50, 0, 0], [0, 0, 0], [0, 50, 0], [0, 0, 0], [0, 0, 10]],
+            dtype=np.float32,
+        )
+        colors = np.array(
+            [
+                [1.0, 0.0, 0.0, 1.0],
+                [1.0, 0.0, 0.0, 1.0],
+                [0.0, 1.0, 0.0, 1.0],
+                [0.0, 1.0, 0.0, 1.0],
+                [0.0, 0.4, 1.0, 1.0],
+                [0.0, 0.4, 1.0, 1.0],
+            ],
+            dtype=np.float32,
+        )
+        axes = gl.GLLinePlotItem(pos=pos, mode="lines", color=colors, width=2.0)
+        self.view.addItem(axes)
+        self._axes = axes
 
     def _clear_jobs(self) -> None:
-        for item in self._job_items.values():
-            self.view.removeItem(item)
-        self._job_items.clear()
-
-        if self._highlight_item is not None:
-            self.view.removeItem(self._highlight_item)
-            self._highlight_item = None
-        if self._highlight_points is not None:
-            self.view.removeItem(self._highlight_points)
-            self._highlight_points = None
-        if self._head_marker is not None:
-            self.view.removeItem(self._head_marker)
-            self._head_marker = None
+        self._job_positions.clear()
+        self._job_geometry.clear()
+        self._job_lods.clear()
+        self._clear_overlays()
+        self._update_scene_item()
+
+    def _clear_overlays(self) -> None:
+        """Hide highlight and head marker (their indices refer to old geometry)."""
+        self._overlay_job_id = None
+        self._hide_highlight()
+        self.reset_simulation_head()
+
+    def _gather_segments(self, seg_pos: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Vertices of segments `idx` of `seg_pos` (n, 2, 3), written into _hl_buf."""
+        need = 2 * len(idx)
+        if need > len(self._hl_buf):
+            self._hl_buf = np.empty((max(need, 2 * len(self._hl_buf)), 3), dtype=np.float32)
+        pos = self._hl_buf[:need]
+        np.take(seg_pos, idx, axis=0, out=pos.reshape(-1, 2, 3))
+        return pos
+
+    def _hide_highlight(self) -> None:
+        self._highlight_shown = False
+        self._highlight_item.setVisible(False)
+        self._highlight_points.setVisible(False)
 
     def _rebuild_scene(self) -> None:
-        self._clear_jobs()
         if self._project is None:
+            self._clear_jobs()
             return
 
-        for job in self._project.jobs:
-            if not job.visible or job.geometry is None:
+        # Jobs whose geometry object is unchanged keep their cached
+        # vertices; everything else is dropped and rebuilt on demand.
+        jobs = {job.id: job for job in self._project.jobs}
+        for job_id in list(self._job_positions):
+            job = jobs.get(job_id)
+            if job is None or self._job_geometry.get(job_id) is not job.geometry:
+                self.invalidate_job(job_id)
+        if self._overlay_job_id is not None and self._overlay_job_id not in jobs:
+            self._clear_overlays()
+
+        self._update_scene_item()
+
+    def _update_scene_item(self) -> None:
+        """Concatenate all jobs' vertices and colours into the scene item.
+
+        Only needed when geometry, the job list or the LOD level changes;
+        hidden jobs are kept in the buffer with alpha 0. Large scenes are
+        drawn from a decimated level of detail chosen from the camera
+        distance; picking and highlights keep full resolution.
+        """
+        parts = []
+        if self._project is not None:
+            for job in self._project.jobs:
+                pos = self._job_positions_for(job)
+                if pos is not None:
+                    parts.append((job, pos))
+
+        full_parts = [(job.id, pos) for job, pos in parts]
+        if not _same_parts(full_parts, self._scene_full_parts):
+            self._scene_full_parts = full_parts
+            self._scene_segments = sum(len(pos) // 2 for _, pos in parts)
+            self._scene_extent = 0.0
+            if parts and self._scene_segments > _LOD_TARGET_SEGMENTS:
+                lo = np.min([pos.min(axis=0) for _, pos in parts], axis=0)
+                hi = np.max([pos.max(axis=0) for _, pos in parts], axis=0)
+                self._scene_extent = float((hi - lo)[:2].max())
+
+        level = self._lod_level()
+        if level > 0:
+            parts = [(job, self._job_lod(job, pos, level)) for job, pos in parts]
+
+        scene_parts = [(job.id, pos) for job, pos in parts]
+        if _same_parts(scene_parts, self._scene_parts):
+            # Same buffer; visibility flags may still have changed
+            self._sync_scene_visibility()
+            return
+        self._scene_parts = scene_parts
+        self._scene_ranges = {}
+        self._scene_shown = {}
+        self._scene_colors = None
+
+        if not parts:
+            self._scene_item.setVisible(False)
+            return
+        start = 0
+        for job, pos in parts:
+            self._scene_ranges[job.id] = (start, len(pos))
+            self._scene_shown[job.id] = True
+            start += len(pos)
+        if len(parts) == 1:
+            # One job: its cached array as-is and a single uniform colour,
+            # no concatenated copy and no per-vertex colour buffer.
+            job, pos = parts[0]
+            self._scene_item.setData(pos=pos, color=tuple(job.color))
+        else:
+            pos = np.concatenate([p for _, p in parts])
+            self._scene_colors = np.repeat(
+                np.array([job.color for job, _ in parts], dtype=np.float32),
+                [len(p) for _, p in parts],
+                axis=0,
+            )
+            self._scene_item.setData(pos=pos, color=self._scene_colors)
+        self._sync_scene_visibility()
+
+    def _sync_scene_visibility(self) -> None:
+        """Match each job's range alpha (and the item's visibility) to job.visible."""
+        any_visible = False
+        changed = False
+        jobs = self._project.jobs if self._project is not None else []
+        for job in jobs:
+            span = self._scene_ranges.get(job.id)
+            if span is None:
+                continue
+            any_visible = any_visible or job.visible
+            if self._scene_shown[job.id] == job.visible:
                 continue
-            item = self._create_job_item(job)
-            if item is not None:
-                self._job_items[job.id] = item
-                self.view.addItem(item)
+            self._scene_shown[job.id] = job.visible
+            if self._scene_colors is not None:
+                start, count = span
+                alpha = job.color[3] if job.visible else 0.0
+                self._scene_colors[start : start + count, 3] = alpha
+                changed = True
+        if changed:
+            # Re-uploads the colour buffer only; positions stay on the GPU
+            self._scene_item.setData(color=self._scene_colors)
+        self._scene_item.setVisible(any_visible)
+
+    def _lod_level(self) -> int:
+        """Coarsest-needed LOD level for the segments currently in view."""
+        if self._scene_segments <= _LOD_TARGET_SEGMENTS:
+            return 0
+        # Fraction of the scene's XY extent the view covers at this distance
+        visible = 1.0
+        if self._scene_extent > 0:
+            dist = float(self.view.opts.get("distance", 200.0))
+            fov = math.radians(float(self.view.opts.get("fov", 60.0)))
+            view_span = 2.0 * dist * math.tan(fov * 0.5)
+            visible = min(1.0, (view_span / self._scene_extent) ** 2)
+        need = self._scene_segments * visible / _LOD_TARGET_SEGMENTS
+        level = bisect.bisect_left(_LOD_FACTORS, need)
+        return min(level, len(_LOD_FACTORS) - 1)
+
+    def _job_lod(self, job: GCodeJob, pos: np.ndarray, level: int) -> np.ndarray:
+        """Decimated copy of a job's vertex array for `level` (cached)."""
+        lods = self._job_lods.setdefault(job.id, [None] * len(_LOD_FACTORS))
+        lod = lods[level]
+        if lod is None:
+            lod = _decimate_path(pos, _LOD_FACTORS[level])
+            lods[level] = lod
+        return lod
+
+    def _job_positions_for(self, job: GCodeJob) -> Optional[np.ndarray]:
+        """Vertex array of a job's segments (built once, then cached)."""
+        pos = self._job_positions.get(job.id)
+        if pos is not None and self._job_geometry.get(job.id) is job.geometry:
+            return pos
+        pos = self._build_job_positions(job)
+        if pos is not None:
+            self._job_positions[job.id] = pos
+            self._job_geometry[job.id] = job.geometry
+        return pos
 
     @staticmethod
-    def _create_job_item(job: GCodeJob) -> Optional[GLGraphicsItem]:
+    def _build_job_positions(job: GCodeJob) -> Optional[np.ndarray]:
         geometry = job.geometry
-        if geometry is None or not geometry.segments:
+        if geometry is None or len(geometry) == 0:
             return None
 
-        pts = []
-        for seg in geometry.segments:
-            x0, y0, z0 = seg.start
-            x1, y1, z1 = seg.end
-            pts.append([x0, y0, z0])
-            pts.append([x1, y1, z1])
-
-        pos = np.array(pts, dtype=float)
-        item = gl.GLLinePlotItem(pos=pos, mode="lines", color=job.color)
-        return item
+        # GL draws float32; converting once here means setData uploads
+        # this buffer as-is instead of converting it again.
+        return np.ascontiguousarray(geometry.vertices, dtype=np.float32)
 
     # ------------------- cursor helpers ---------------------
 
+    def _on_zoom_changed(self) -> None:
+        self._update_grid_spacing()
+        # Re-selects the LOD; a no-op unless the level actually changes
+        self._update_scene_item()
+
     def _update_grid_spacing(self) -> None:
         """Adjust grid spacing based on camera distance (NC-viewer style)."""
         dist = float(self.view.opts.get("distance", 200.0))
@@ -356,72 +592,204 @@ class GCodeViewer(QWidget):
             dist = 1.0
 
         target = dist / 20.0
-
-        base = 10 ** math.floor(math.log10(target))
-        mult = target / base
-        if mult < 1.5:
-            step = base
-        elif mult < 3.5:
-            step = 2 * base
-        else:
-            step = 5 * base
-
-        step = max(0.01, min(step, 50.0))
+        step = _GRID_STEPS[bisect.bisect_right(_GRID_THRESHOLDS, target)]
+        if (step, step) == self._grid_spacing:
+            # Same decade step: nothing to re-issue (size is fixed in __init__)
+            return
 
         self._grid.setSpacing(step, step)
-        self._grid.setSize(2000, 2000)
 
         self._grid_spacing = (step, step)
         self._pick_radius = step * 0.5
 
     def _update_cursor_from_mouse(self, ev: QMouseEvent) -> None:
         pos = ev.position() if hasattr(ev, "position") else ev.pos()
-        res = self._unproject_to_plane(pos.x(), pos.y(), plane_z=0.0)
-        if res is None:
+        self._pending_mouse_pos = (pos.x(), pos.y())
+        if not self._cursor_timer.isActive():
+            self._cursor_timer.start()
+
+    def _emit_cursor(self) -> None:
+        pending = self._pending_mouse_pos
+        self._pending_mouse_pos = None
+        if pending is None:
+            return
+        point = self._unproject_point(pending[0], pending[1], plane_z=0.0)
+        if point is None:
             return
-        wx, wy, wz = res
 
         # Snap to 0.01 mm resolution
-        qx = round(wx * 100.0) / 100.0
-        qy = round(wy * 100.0) / 100.0
-        qz = round(wz * 100.0) / 100.0
+        qx, qy, qz = (np.round(point * 100.0) / 100.0).tolist()
+        if (qx, qy, qz) == self._last_cursor:
+            # Sub-resolution motion: the readout would not change
+            return
+        self._last_cursor = (qx, qy, qz)
 
         if self.cursor_moved_callback is not None:
             self.cursor_moved_callback(qx, qy, qz)
 
+    def _pick_from_mouse(self, ev: QMouseEvent) -> None:
+        # Picking works in XY, so it is only meaningful looking straight down
+        if self.segment_picked_callback is None or self.view.opts["elevation"] < 89.0:
+            return
+        pos = ev.position() if hasattr(ev, "position") else ev.pos()
+        point = self._unproject_point(pos.x(), pos.y(), plane_z=0.0)
+        if point is None:
+            return
+        hit = self._pick_segment_at(float(point[0]), float(point[1]))
+        if hit is not None:
+            self.segment_picked_callback(*hit)
+
+    def _pick_segment_at(self, x: float, y: float) -> Optional[Tuple[GCodeJob, int]]:
+        """Visible segment nearest to (x, y) in XY within the pick radius."""
+        if self._project is None:
+            return None
+
+        p = np.array([x, y], dtype=np.float32)
+        best: Optional[Tuple[GCodeJob, int]] = None
+        best_d2 = self._pick_radius * self._pick_radius
+        for job in self._project.jobs:
+            if not job.visible:
+                continue
+            pos = self._job_positions_for(job)
+            if pos is None:
+                continue
+            starts = pos[0::2, :2]
+            v = pos[1::2, :2] - starts
+            w = p - starts
+            # Closest point on each segment: clamp the projection of w on v
+            seg_len_sq = np.einsum("ij,ij->i", v, v)
+            t = np.einsum("ij,ij->i", v, w) / np.where(seg_len_sq > 1e-12, seg_len_sq, 1.0)
+            np.clip(t, 0.0, 1.0, out=t)
+            d = w - t[:, None] * v
+            d2 = np.einsum("ij,ij->i", d, d)
+            i = int(d2.argmin())
+            if d2[i] <= best_d2:
+                best_d2 = float(d2[i])
+                best = (job, i)
+        return best
+
     def _unproject_to_plane(
         self, win_x: float, win_y: float, plane_z: float
     ) -> Optional[Tuple[float, float, float]]:
         """Unproject 2D screen coords to intersection with Z=plane_z in world space."""
-        try:
-            self.view.makeCurrent()
-            model = glGetDoublev(GL_MODELVIEW_MATRIX)
-            proj = glGetDoublev(GL_PROJECTION_MATRIX)
-            viewport = glGetIntegerv(GL_VIEWPORT)
-        except Exception:
+        point = self._unproject_point(win_x, win_y, plane_z)
+        if point is None:
             return None
-        finally:
-            try:
-                self.view.doneCurrent()
-            except Exception:
-                pass
+        x, y, z = point.tolist()
+        return x, y, z
 
-        win_y_flipped = viewport[3] - win_y
+    def _unproject_point(
+        self, win_x: float, win_y: float, plane_z: float
+    ) -> Optional[np.ndarray]:
+        """Same as _unproject_to_plane, as a float64 array of shape (3,)."""
+        matrices = self._current_gl_matrices()
+        if matrices is None:
+            return None
+        inv_mvp, viewport = matrices
+
+        # Window -> normalized device coords at the near (-1) and far (+1)
+        # planes, then back to world space: what gluUnProject does, without
+        # two FFI calls per mouse move.
+        ndc_x = 2.0 * (win_x - viewport[0]) / viewport[2] - 1.0
+        ndc_y = 2.0 * ((viewport[3] - win_y) - viewport[1]) / viewport[3] - 1.0
+        clip = np.array(
+            [[ndc_x, ndc_y, -1.0, 1.0], [ndc_x, ndc_y, 1.0, 1.0]], dtype=np.float64
+        )
+        world = clip @ inv_mvp.T
+        w = world[:, 3]
+        if abs(w[0]) < 1e-12 or abs(w[1]) < 1e-12:
+            return None
+        near = world[0, :3] / w[0]
+        ray = world[1, :3] / w[1] - near
+        if abs(ray[2]) < 1e-6:
+            return None
 
+        return near + ray * ((plane_z - near[2]) / ray[2])
+
+    def _camera_key(self) -> tuple:
+        """Everything the view's modelview/projection/viewport depend on."""
+        opts = self.view.opts
+        center = opts["center"]
+        return (
+            opts["distance"],
+            opts["elevation"],
+            opts["azimuth"],
+            opts["fov"],
+            (center.x(), center.y(), center.z()),
+            str(opts.get("rotation")),
+            self.view.width(),
+            self.view.height(),
+        )
+
+    def _current_gl_matrices(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Inverse model-view-projection and viewport, cached until the camera moves.
+
+        The matrices come from GLViewWidget itself (the same ones it uses
+        to paint), so no GL context or glGet* round trip is needed.
+        """
+        key = self._camera_key()
+        cached = self._gl_matrices
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        w, h = self.view.width(), self.view.height()
+        if w <= 0 or h <= 0:
+            return None
+        viewport = (0, 0, w, h)
+        # copyDataTo() is row-major, i.e. already the math-convention matrix
+        model = np.array(self.view.viewMatrix().copyDataTo(), dtype=np.float64).reshape(4, 4)
+        proj = np.array(
+            self.view.projectionMatrix(viewport, viewport).copyDataTo(), dtype=np.float64
+        ).reshape(4, 4)
         try:
-            near = gluUnProject(win_x, win_y_flipped, 0.0, model, proj, viewport)
-            far = gluUnProject(win_x, win_y_flipped, 1.0, model, proj, viewport)
-        except Exception:
+            inv_mvp = np.linalg.inv(proj @ model)
+        except np.linalg.LinAlgError:
             return None
 
-        nx, ny, nz = near
-        fx, fy, fz = far
-        dz = fz - nz
-        if abs(dz) < 1e-6:
-            return None
+        self._gl_matrices = (key, inv_mvp, np.array(viewport, dtype=np.float64))
+        return inv_mvp, self._gl_matrices[2]
 
-        t = (plane_z - nz) / dz
-        x = nx + (fx - nx) * t
-        y = ny + (fy - ny) * t
-        z = nz + (fz - nz) * t
-        return float(x), float(y), float(z)
+
+def _same_parts(
+    parts: List[Tuple[str, np.ndarray]], other: List[Tuple[str, np.ndarray]]
+) -> bool:
+    """True if both (job id, array) lists hold the same array objects."""
+    return len(parts) == len(other) and all(
+        job_id == old_id and pos is old_pos
+        for (job_id, pos), (old_id, old_pos) in zip(parts, other)
+    )
+
+
+def _decimate_path(pos: np.ndarray, factor: int) -> np.ndarray:
+    """Line-pair vertices of the toolpath in `pos` keeping ~1/factor points.
+
+    Consecutive segments are joined into longer chords, so the path stays
+    connected. Segment ends where Z changes (plunges, retracts) and ends
+    before a gap in the path are always kept.
+    """
+    starts = pos[0::2]
+    ends = pos[1::2]
+    n = len(starts)
+    # Break after segment i: the next segment doesn't start where i ends
+    brk = np.any(starts[1:] != ends[:-1], axis=1)
+    dz = starts[:, 2] != ends[:, 2]
+
+    keep = np.zeros(n, dtype=bool)
+    keep[factor - 1 :: factor] = True
+    keep[-1] = True
+    keep |= dz
+    keep[:-1] |= dz[1:] | brk
+    keep[1:] |= brk
+
+    k = np.flatnonzero(keep)
+    line_start = np.empty((len(k), 3), dtype=pos.dtype)
+    line_start[0] = starts[0]
+    line_start[1:] = ends[k[:-1]]
+    # Across a gap both neighbours are kept, so the chord is the segment itself
+    after_break = brk[k[1:] - 1]
+    line_start[1:][after_break] = starts[k[1:][after_break]]
+
+    out = np.empty((2 * len(k), 3), dtype=pos.dtype)
+    out[0::2] = line_start
+    out[1::2] = ends[k]
+    return out
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.import_pipeline import import_gcode_file, parse_source
+
+
+class ReparseSignals(QObject):
+    """Signals for ReparseTask (QRunnable itself cannot emit signals).
+
+    - finished(job_id, token, parsed)
+    - failed(job_id, token, message)
+    """
+
+    finished = Signal(str, int, object)
+    failed = Signal(str, int, str)
+
+
+class ReparseTask(QRunnable):
+    """Parse G-code text and build geometry on a QThreadPool worker.
+
+    Only the text is handed to the worker; the job itself is updated on
+    the GUI thread when `finished` is delivered.
+    """
+
+    def __init__(self, job_id: str, token: int, source: str) -> None:
+        super().__init__()
+        self.job_id = job_id
+        self.token = token
+        self.source = source
+        self.signals = ReparseSignals()
+
+    def run(self) -> None:
+        try:
+            parsed = parse_source(self.source)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.signals.failed.emit(self.job_id, self.token, str(exc))
+            return
+        self.signals.finished.emit(self.job_id, self.token, parsed)
+
+
+class ImportSignals(QObject):
+    """Signals for ImportTask.
+
+    - finished(batch, index, job)
+    - failed(batch, index, message)
+    """
+
+    finished = Signal(int, int, object)
+    failed = Signal(int, int, str)
+
+
+class ImportTask(QRunnable):
+    """Read and parse one .nc file on a QThreadPool worker.
+
+    The resulting GCodeJob is not added to any project here; MainWindow
+    collects all jobs of a batch and adds them in selection order.
+    """
+
+    def __init__(self, batch: int, index: int, path: Path) -> None:
+        super().__init__()
+        self.batch = batch
+        self.index = index
+        self.path = path
+        self.signals = ImportSignals()
+
+    def run(self) -> None:
+        try:
+            job = import_gcode_file(self.path)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.signals.failed.emit(self.batch, self.index, str(exc))
+            return
+        self.signals.finished.emit(self.batch, self.index, job)
+
+
+def start_process_imports(batch: int, paths: List[Path], signals: ImportSignals) -> List[Future]:
+    """Parse several .nc files in worker processes.
+
+    Parsing is pure Python and holds the GIL, so threads do not overlap
+    it; separate processes do. Each result is pickled back and reported
+    through `signals` exactly like ImportTask (signals must belong to the
+    GUI thread so delivery is queued). Returns the futures so pending
+    files can be cancelled.
+    """
+    # "spawn" rather than fork: the GUI process already runs Qt threads.
+    executor = ProcessPoolExecutor(
+        max_workers=min(len(paths), os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    futures = []
+    for index, path in enumerate(paths):
+        future = executor.submit(import_gcode_file, path)
+        future.add_done_callback(partial(_emit_import_result, signals, batch, index))
+        futures.append(future)
+    # Workers exit once the queued files are done (or cancelled)
+    executor.shutdown(wait=False)
+    return futures
+
+
+def _emit_import_result(signals: ImportSignals, batch: int, index: int, future: Future) -> None:
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        signals.failed.emit(batch, index, str(exc))
+        return
+    signals.finished.emit(batch, index, future.result())
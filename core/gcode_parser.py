@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 
 @dataclass
 class GCodeStatement:
+    # One instance per source line: slots keep them small. Declared by
+    # hand since dataclass(slots=True) needs Python 3.10; a slotted class
+    # can't have class-level defaults, so `comment` has none.
+    __slots__ = ("line_number", "raw", "command", "params", "comment")
+
     line_number: int
     raw: str
     command: str
     params: Dict[str, float]
-    comment: Optional[str] = None
+    comment: Optional[str]
 
 
 @dataclass
@@ -30,72 +36,63 @@ def parse_gcode(source: str) -> GCodeProgram:
     statements: List[GCodeStatement] = []
 
     lines = source.splitlines()
-    for line_number, line in enumerate(lines, start=1):
-        raw = line.rstrip("\n")
-
+    for line_number, raw in enumerate(lines, start=1):
         # ---- split off comments: ; or (. )
         comment: Optional[str] = None
         code_part = raw
 
-        # ; style
-        semi_idx = code_part.find(";")
-        if semi_idx != -1:
-            comment = code_part[semi_idx + 1 :].strip()
-            code_part = code_part[:semi_idx]
-
-        # ( . ) style – take the first '(' as start of comment
-        paren_idx = code_part.find("(")
-        if paren_idx != -1:
-            trailing = code_part[paren_idx + 1 :].strip()
-            if trailing:
-                comment = trailing if comment is None else f"{comment} ({trailing})"
-            code_part = code_part[:paren_idx]
-
-        code_part = code_part.strip()
+        # Most lines carry no comment; skip both scans for them
+        if ";" in code_part or "(" in code_part:
+            # ; style
+            semi_idx = code_part.find(";")
+            if semi_idx != -1:
+                comment = code_part[semi_idx + 1 :].strip()
+                code_part = code_part[:semi_idx]
+
+            # ( . ) style – take the first '(' as start of comment
+            paren_idx = code_part.find("(")
+            if paren_idx != -1:
+                trailing = code_part[paren_idx + 1 :].strip()
+                if trailing:
+                    comment = trailing if comment is None else f"{comment} ({trailing})"
+                code_part = code_part[:paren_idx]
 
         command = ""
         params: Dict[str, float] = {}
 
-        if code_part:
-            tokens = code_part.split()
-            for tok in tokens:
-                if not tok:
-                    continue
-                letter = tok[0].upper()
-                rest = tok[1:]
-
-                # Token must be like X12.3 or G01 or Y-5 etc
-                if not rest:
-                    continue
-
-                # Try to interpret as float parameter
-                # (we'll treat any letter+number as param first,
-                # but G/M tokens become "command" if we don't yet have one)
-                try:
-                    value = float(rest)
-                    is_number = True
-                except ValueError:
-                    is_number = False
-
-                if is_number:
-                    if letter in ("G", "M") and command == "":
-                        # G / M token -> command (e.g. G1, G01, M3)
-                        command = letter + rest
-                    else:
-                        # Coordinate / feed parameter
-                        params[letter] = value
-                else:
-                    # Not numeric, ignore
-                    continue
-
-        stmt = GCodeStatement(
-            line_number=line_number,
-            raw=raw,
-            command=command,
-            params=params,
-            comment=comment,
+        # Upper-case the line once rather than every token's letter.
+        # str.split() + float() measured faster than a regex tokenizer here;
+        # the except only runs for malformed words, which are rare.
+        for tok in code_part.upper().split():
+            # Token must be like X12.3 or G01 or Y-5 etc
+            rest = tok[1:]
+            if not rest:
+                continue
+            try:
+                value = float(rest)
+            except ValueError:
+                # Not numeric, ignore
+                continue
+
+            letter = tok[0]
+            if command == "" and (letter == "G" or letter == "M"):
+                # G / M token -> command (e.g. G1, G01, M3). Interned: the
+                # same few codes repeat on every line, and interned strings
+                # hash once and compare by identity in set/dict lookups.
+                command = sys.intern(letter + rest)
+            else:
+                # Coordinate / feed parameter
+                params[letter] = value
+
+        statements.append(
+            GCodeStatement(
+                line_number=line_number,
+                raw=raw,
+                command=command,
+                params=params,
+                comment=comment,
+            )
         )
-        statements.append(stmt)
 
     return GCodeProgram(statements=statements)
 
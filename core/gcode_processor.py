@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import List
 
@@ -10,9 +11,18 @@ class ProcessedJob:
     original_source: str
 
 
-def _strip_inline_comment(line: str) -> str:
-    """Strip inline comments starting with ';'."""
-    return line.split(";", 1)[0]
+# Whitespace-delimited words, matched in place of strip()/upper()/split():
+# an S word (S followed by a digit, sign or '.') and an M5 / M05 word.
+# The letter comes first so re can skip ahead to it; (?<!\S\S) then checks
+# that the letter starts a word.
+_S_WORD_RE = re.compile(r"S(?<!\S\S)[\d+\-.]")
+_M5_WORD_RE = re.compile(r"[Mm](?<!\S\S)0?5(?!\S)")
+
+
+def _code_end(line: str) -> int:
+    """Index where the inline ';' comment starts (len(line) if none)."""
+    semi = line.find(";")
+    return len(line) if semi == -1 else semi
 
 
 def _is_full_line_comment(line: str) -> bool:
@@ -24,33 +34,24 @@ def _has_spindle_s(line: str) -> bool:
     """
     Return True if line contains an S word used as G-code (not inside comments).
     """
-    if _is_full_line_comment(line):
+    if "S" not in line:
+        # Most lines: a C-level substring test rules them out
         return False
-    code = _strip_inline_comment(line).strip()
-    if not code:
+    if _S_WORD_RE.search(line, 0, _code_end(line)) is None:
         return False
-    for token in code.split():
-        if token.startswith("S") and len(token) > 1:
-            # S followed by number or sign/decimal
-            ch = token[1]
-            if ch.isdigit() or ch in "+-.":
-                return True
-    return False
+    return not _is_full_line_comment(line)
 
 
 def _has_m5(line: str) -> bool:
     """
     Return True if line contains an M5/M05 word used as G-code (not inside comments).
     """
-    if _is_full_line_comment(line):
+    if "5" not in line:
+        # Every M5 / M05 word contains a '5', whatever the letter case
         return False
-    code = _strip_inline_comment(line).strip().upper()
-    if not code:
+    if _M5_WORD_RE.search(line, 0, _code_end(line)) is None:
         return False
-    for token in code.split():
-        if token in ("M5", "M05"):
-            return True
-    return False
+    return not _is_full_line_comment(line)
 
 
 def extract_body(source: str) -> List[str]:
@@ -97,6 +98,11 @@ def extract_body(source: str) -> List[str]:
     return body or lines
 
 
+def extract_body_text(source: str) -> str:
+    """extract_body(source) joined with newlines."""
+    return "\n".join(extract_body(source))
+
+
 def process_gcode_file(content: str) -> ProcessedJob:
     body = extract_body(content)
     return ProcessedJob(body_lines=body, original_source=content)
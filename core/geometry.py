@@ -1,18 +1,81 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
 
 
 @dataclass
 class ProgramIndex:
     """Maps between program statements and geometry segments."""
 
-    # statement index (0-based) -> list of segment indices
-    statement_to_segments: Dict[int, List[int]] = field(default_factory=dict)
-    # segment index -> statement index
-    segment_to_statement: Dict[int, int] = field(default_factory=dict)
+    # CSR statement -> segments map: the segments of statement i are
+    # flat_segments[seg_offsets[i]:seg_offsets[i + 1]].
+    seg_offsets: np.ndarray
+    flat_segments: np.ndarray
+    # Inverse of the CSR map: statement index of every segment (int32).
+    # Segment indices are dense, so an array replaces a dict.
+    segment_to_statement: np.ndarray
+    # True when flat_segments is 0..n-1 (segments emitted in statement
+    # order, as the geometry builder does); any CSR span [begin, end) is
+    # then simply the segment range begin..end-1.
+    segments_in_order: bool = False
+
+    # Source line number of every statement (int32, sorted since statements
+    # are in file order). Public so any line-range query (highlight, find,
+    # go-to-line, ...) can use np.searchsorted instead of scanning.
+    line_numbers: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_segment_statements(
+        cls, segment_statements: np.ndarray, statement_count: int
+    ) -> "ProgramIndex":
+        """Index built straight from the statement index of every segment.
+
+        One stable argsort groups segments by statement and a bincount gives
+        the CSR offsets; no per-segment Python containers are created.
+        """
+        seg_stmts = np.asarray(segment_statements, dtype=np.int32)
+        counts = np.bincount(seg_stmts, minlength=statement_count)
+        offsets = np.zeros(statement_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        in_order = bool(np.all(seg_stmts[1:] >= seg_stmts[:-1]))
+        if in_order:
+            flat = np.arange(len(seg_stmts), dtype=np.int32)
+        else:
+            flat = np.argsort(seg_stmts, kind="stable").astype(np.int32)
+        return cls(
+            seg_offsets=offsets,
+            flat_segments=flat,
+            segment_to_statement=seg_stmts,
+            segments_in_order=in_order,
+        )
+
+    def statement_for_segment(self, segment_index: int) -> Optional[int]:
+        """Statement that produced `segment_index` (O(1)), or None."""
+        inverse = self.segment_to_statement
+        if not 0 <= segment_index < len(inverse):
+            return None
+        return int(inverse[segment_index])
+
+    def segment_span_for_lines(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """
+        [begin, end) range into flat_segments for source lines
+        start_line..end_line. Equal spans mean equal segment sets.
+        """
+        if self.line_numbers is None:
+            return 0, 0
+        lo = np.searchsorted(self.line_numbers, start_line, side="left")
+        hi = np.searchsorted(self.line_numbers, end_line, side="right")
+        return int(self.seg_offsets[lo]), int(self.seg_offsets[hi])
+
+    def segments_for_statement(self, stmt_index: int) -> np.ndarray:
+        """Segment indices of one statement as an int32 array (empty if none)."""
+        if not 0 <= stmt_index < len(self.seg_offsets) - 1:
+            return np.empty(0, dtype=np.int32)
+        return self.segments_for_statements(stmt_index, stmt_index + 1)
 
-    def add_link(self, statement_index: int, segment_index: int) -> None:
-        self.segment_to_statement[segment_index] = statement_index
-        self.statement_to_segments.setdefault(statement_index, []).append(segment_index)
+    def segments_for_statements(self, lo: int, hi: int) -> np.ndarray:
+        """Segment indices of statements lo..hi-1 (CSR slice, no copy)."""
+        return self.flat_segments[self.seg_offsets[lo] : self.seg_offsets[hi]]
@@ -15,10 +15,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
 import math
 
+import numpy as np
+
 from core.gcode_parser import GCodeProgram, GCodeStatement
 from core.geometry import ProgramIndex
 
@@ -27,23 +29,84 @@ Point3D = Tuple[float, float, float]
 
 
 @dataclass
-class ToolpathSegment:
-    start: Point3D
-    end: Point3D
+class ToolpathGeometry:
+    """Toolpath segments stored as one vertex array.
+
+    `vertices` is (2 * n_segments, 3) float64: segment i is rows 2i (start)
+    and 2i + 1 (end), which is also the layout GL line lists use.
+    """
 
+    vertices: np.ndarray
 
-@dataclass
-class ToolpathGeometry:
-    segments: List[ToolpathSegment]
+    def __len__(self) -> int:
+        return len(self.vertices) // 2
 
 
 # ---------------------------------------------------------------------------
 
+_LINEAR_CMDS = frozenset(("G0", "G00", "G1", "G01"))
+_ARC_CMDS = frozenset(("G2", "G02", "G3", "G03"))
+_ARC_CW_CMDS = frozenset(("G2", "G02"))
+
+# Arcs with at least this many subdivisions are evaluated with NumPy; below
+# it the fixed cost of the array calls outweighs the per-step Python loop.
+# Measured crossover ~100-110 steps. With the chord tolerance and the 1 deg
+# floor an arc takes 2..360 steps: small and medium arcs stay scalar, large
+# radii / near-full circles go vectorised.
+_ARC_VECTOR_MIN_STEPS = 112
+
+
+def _emit_arc(
+    coords: List[float],
+    start: Point3D,
+    end_z: float,
+    cx: float,
+    cy: float,
+    r: float,
+    ang0: float,
+    sweep: float,
+    steps: int,
+) -> None:
+    """Append `steps` chords of an XY arc to `coords` (6 floats per chord)."""
+    x, y, z = start
+    if steps < _ARC_VECTOR_MIN_STEPS:
+        # Rotate the radius vector by a fixed step instead of calling
+        # cos/sin per point; drift stays ~1e-14 over < 112 steps.
+        step = sweep / steps
+        dc = math.cos(step)
+        ds = math.sin(step)
+        rc = r * math.cos(ang0)
+        rs = r * math.sin(ang0)
+        last_x, last_y, last_z = x, y, z
+        for i in range(1, steps + 1):
+            rc, rs = rc * dc - rs * ds, rs * dc + rc * ds
+            px = cx + rc
+            py = cy + rs
+            pz = z + (end_z - z) * (i / steps)  # simple linear Z along arc
+
+            coords.extend((last_x, last_y, last_z, px, py, pz))
+
+            last_x, last_y, last_z = px, py, pz
+        return
+
+    t = np.arange(1, steps + 1, dtype=np.float64) / steps
+    theta = ang0 + sweep * t
+    pts = np.empty((steps + 1, 3), dtype=np.float64)
+    pts[0] = start
+    pts[1:, 0] = cx + r * np.cos(theta)
+    pts[1:, 1] = cy + r * np.sin(theta)
+    pts[1:, 2] = z + (end_z - z) * t
+    chords = np.empty((steps, 6), dtype=np.float64)
+    chords[:, :3] = pts[:-1]
+    chords[:, 3:] = pts[1:]
+    coords.extend(chords.ravel().tolist())
+
 
 def build_geometry_and_index(
     program: GCodeProgram,
     *,
-    arc_subdiv_max_angle_deg: float = 10.0,
+    arc_chord_tolerance: float = 0.01,
+    arc_subdiv_max_angle_deg: float = 45.0,
 ) -> Tuple[ToolpathGeometry, ProgramIndex]:
     """
     Convert a parsed GCodeProgram into ToolpathGeometry + ProgramIndex.
@@ -53,11 +116,21 @@ def build_geometry_and_index(
     - We DO NOT round coordinates.
     - For linear moves we produce exactly one segment per statement.
     - For arcs we interpolate with small segments using center mode (I/J).
+      The number of chords follows the radius, not a fixed angle: each
+      chord may deviate at most `arc_chord_tolerance` (default 0.01 mm)
+      from the true arc, i.e. the angle per chord is 2 * acos(1 - tol / r).
+      That angle is clamped to 1 deg .. `arc_subdiv_max_angle_deg`
+      (default 45 deg, capped at 45), so an arc has at least 2 chords and a
+      full circle at most 360. Arcs with r <= tolerance use the maximum
+      angle.
     """
+    max_ang_cap = math.radians(max(1.0, min(arc_subdiv_max_angle_deg, 45.0)))
+    min_ang = math.radians(1.0)
 
-    segments: List[ToolpathSegment] = []
-    stmt_to_segs: Dict[int, List[int]] = {}
-    seg_to_stmt: Dict[int, int] = {}
+    # Flat x0, y0, z0, x1, y1, z1 per segment; becomes ToolpathGeometry.vertices
+    coords: List[float] = []
+    # Statement index of every segment; becomes the ProgramIndex CSR
+    seg_stmts: List[int] = []
 
     # Simple modal state: absolute vs relative; position in XYZ.
     absolute = True  # assume G90 by default
@@ -65,130 +138,97 @@ def build_geometry_and_index(
 
     # XY-plane arcs (G17) only – which is what your PCB files use.
     for stmt_index, stmt in enumerate(program.statements):
-        cmd = stmt.command.upper() if hasattr(stmt, "command") else ""
-        params = getattr(stmt, "params", {})  # dict like {"X":..., "Y":..., "I":...}
+        # parse_gcode upper-cases and interns commands
+        cmd = stmt.command
+        params = stmt.params  # dict like {"X":..., "Y":..., "I":...}
 
-        if cmd in ("G90",):  # absolute
+        if cmd == "G90":  # absolute
             absolute = True
             continue
-        if cmd in ("G91",):  # incremental
+        if cmd == "G91":  # incremental
             absolute = False
             continue
 
-        # Position updates: figure target XYZ from modal state + params
-        def get_target(
-            cur_x: float, cur_y: float, cur_z: float
-        ) -> Point3D:
-            tx = cur_x
-            ty = cur_y
-            tz = cur_z
-
-            if "X" in params:
-                tx = (
-                    cur_x + float(params["X"])
-                    if not absolute
-                    else float(params["X"])
-                )
-            if "Y" in params:
-                ty = (
-                    cur_y + float(params["Y"])
-                    if not absolute
-                    else float(params["Y"])
-                )
-            if "Z" in params:
-                tz = (
-                    cur_z + float(params["Z"])
-                    if not absolute
-                    else float(params["Z"])
-                )
-
-            return tx, ty, tz
+        is_linear = cmd in _LINEAR_CMDS
+        if not is_linear and cmd not in _ARC_CMDS:
+            # Everything else: ignore for geometry (feeds, units, etc.)
+            continue
+
+        # Target XYZ from modal state + params; a missing axis keeps its value
+        px = params.get("X")
+        py = params.get("Y")
+        pz = params.get("Z")
+        if absolute:
+            nx = x if px is None else float(px)
+            ny = y if py is None else float(py)
+            nz = z if pz is None else float(pz)
+        else:
+            nx = x if px is None else x + float(px)
+            ny = y if py is None else y + float(py)
+            nz = z if pz is None else z + float(pz)
 
         # -------------------------- linear / rapid ---------------------
-        if cmd in ("G0", "G00", "G1", "G01"):
-            nx, ny, nz = get_target(x, y, z)
+        if is_linear:
             if (nx, ny, nz) != (x, y, z):
-                seg_index = len(segments)
-                seg = ToolpathSegment(start=(x, y, z), end=(nx, ny, nz))
-                segments.append(seg)
-                stmt_to_segs.setdefault(stmt_index, []).append(seg_index)
-                seg_to_stmt[seg_index] = stmt_index
+                coords.extend((x, y, z, nx, ny, nz))
+                seg_stmts.append(stmt_index)
             x, y, z = nx, ny, nz
             continue
 
         # ----------------------------- arcs ----------------------------
-        if cmd in ("G2", "G02", "G3", "G03"):
-            # Very common in PCB isolation routes.
-            # We assume XY-plane arcs using I,J offsets (centre mode).
-            nx, ny, nz = get_target(x, y, z)
-            cw = cmd in ("G2", "G02")
-
-            # Default: no movement if we don't have enough info
-            if ("I" not in params and "J" not in params) or (nx == x and ny == y):
-                # Fallback: treat as straight line
-                seg_index = len(segments)
-                seg = ToolpathSegment(start=(x, y, z), end=(nx, ny, nz))
-                segments.append(seg)
-                stmt_to_segs.setdefault(stmt_index, []).append(seg_index)
-                seg_to_stmt[seg_index] = stmt_index
-                x, y, z = nx, ny, nz
-                continue
-
-            cx = x + float(params.get("I", 0.0))
-            cy = y + float(params.get("J", 0.0))
-
-            # radii (for sanity, but not enforced hard)
-            rs = math.hypot(x - cx, y - cy)
-            re = math.hypot(nx - cx, ny - cy)
-            r = (rs + re) * 0.5 if (rs > 0 and re > 0) else max(rs, re)
-
-            # start and end angles
-            ang0 = math.atan2(y - cy, x - cx)
-            ang1 = math.atan2(ny - cy, nx - cx)
-
-            # sweep
-            if cw:
-                if ang1 >= ang0:
-                    ang1 -= 2.0 * math.pi
-            else:
-                if ang1 <= ang0:
-                    ang1 += 2.0 * math.pi
-
-            sweep = ang1 - ang0  # signed
-            total_angle = abs(sweep)
-
-            # number of segments based on max angle per segment
-            max_ang = math.radians(max(1.0, min(arc_subdiv_max_angle_deg, 45.0)))
-            steps = max(2, int(math.ceil(total_angle / max_ang)))
-
-            last_x, last_y, last_z = x, y, z
-
-            for i in range(1, steps + 1):
-                t = i / steps
-                theta = ang0 + sweep * t
-                px = cx + r * math.cos(theta)
-                py = cy + r * math.sin(theta)
-                pz = z + (nz - z) * t  # simple linear Z along arc
-
-                seg_index = len(segments)
-                seg = ToolpathSegment(
-                    start=(last_x, last_y, last_z),
-                    end=(px, py, pz),
-                )
-                segments.append(seg)
-                stmt_to_segs.setdefault(stmt_index, []).append(seg_index)
-                seg_to_stmt[seg_index] = stmt_index
-
-                last_x, last_y, last_z = px, py, pz
-
+        # Very common in PCB isolation routes.
+        # We assume XY-plane arcs using I,J offsets (centre mode).
+        cw = cmd in _ARC_CW_CMDS
+
+        # Default: no movement if we don't have enough info
+        if ("I" not in params and "J" not in params) or (nx == x and ny == y):
+            # Fallback: treat as straight line
+            coords.extend((x, y, z, nx, ny, nz))
+            seg_stmts.append(stmt_index)
             x, y, z = nx, ny, nz
             continue
 
-        # Everything else: ignore for geometry (feeds, units, etc.)
-
-    geometry = ToolpathGeometry(segments=segments)
-    index = ProgramIndex(
-        statement_to_segments=stmt_to_segs,
-        segment_to_statement=seg_to_stmt,
+        cx = x + float(params.get("I", 0.0))
+        cy = y + float(params.get("J", 0.0))
+
+        # radii (for sanity, but not enforced hard)
+        rs = math.hypot(x - cx, y - cy)
+        re = math.hypot(nx - cx, ny - cy)
+        r = (rs + re) * 0.5 if (rs > 0 and re > 0) else max(rs, re)
+
+        # start and end angles
+        ang0 = math.atan2(y - cy, x - cx)
+        ang1 = math.atan2(ny - cy, nx - cx)
+
+        # sweep
+        if cw:
+            if ang1 >= ang0:
+                ang1 -= 2.0 * math.pi
+        else:
+            if ang1 <= ang0:
+                ang1 += 2.0 * math.pi
+
+        sweep = ang1 - ang0  # signed
+        total_angle = abs(sweep)
+
+        # number of segments: largest angle whose chord stays within the
+        # tolerance (sagitta r * (1 - cos(a / 2)) <= tol), clamped
+        if r > arc_chord_tolerance:
+            max_ang = 2.0 * math.acos(1.0 - arc_chord_tolerance / r)
+            max_ang = min(max(max_ang, min_ang), max_ang_cap)
+        else:
+            max_ang = max_ang_cap
+        steps = max(2, int(math.ceil(total_angle / max_ang)))
+
+        _emit_arc(coords, (x, y, z), nz, cx, cy, r, ang0, sweep, steps)
+        seg_stmts.extend([stmt_index] * steps)
+
+        x, y, z = nx, ny, nz
+
+    geometry = ToolpathGeometry(
+        vertices=np.array(coords, dtype=np.float64).reshape(-1, 3)
+    )
+    index = ProgramIndex.from_segment_statements(
+        np.array(seg_stmts, dtype=np.int32), len(program.statements)
     )
     return geometry, index
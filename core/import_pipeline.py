@@ -3,13 +3,18 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Tuple
 
+import numpy as np
+
 from core.gcode_parser import parse_gcode, GCodeProgram
 from core.geometry_builder import build_geometry_and_index, ToolpathGeometry
 from core.geometry import ProgramIndex
 from core.project_model import GCodeJob
 
 
-def _build_for_source(source: str) -> Tuple[GCodeProgram, ToolpathGeometry, ProgramIndex]:
+ParsedSource = Tuple[GCodeProgram, ToolpathGeometry, ProgramIndex]
+
+
+def _build_for_source(source: str) -> ParsedSource:
     """
     Parse raw G-code text and build geometry + index.
 
@@ -18,6 +23,10 @@ def _build_for_source(source: str) -> Tuple[GCodeProgram, ToolpathGeometry, Prog
     """
     program = parse_gcode(source)
     geometry, index = build_geometry_and_index(program)
+    statements = program.statements
+    index.line_numbers = np.fromiter(
+        (stmt.line_number for stmt in statements), dtype=np.int32, count=len(statements)
+    )
     return program, geometry, index
 
 
@@ -37,14 +46,22 @@ def import_gcode_file(path: Path) -> GCodeJob:
     return job
 
 
-def reparse_job(job: GCodeJob, new_source: str) -> None:
+def parse_source(source: str) -> ParsedSource:
     """
-    Re-parse a job after editing in the G-code editor.
-    This regenerates program, geometry and index in-place.
+    Parse text into program/geometry/index without touching any job.
+
+    This is the expensive half of a re-parse and is safe to run on a
+    worker thread; hand the result to apply_parsed_source afterwards.
     """
-    program, geometry, index = _build_for_source(new_source)
+    return _build_for_source(source)
+
+
+def apply_parsed_source(job: GCodeJob, new_source: str, parsed: ParsedSource) -> None:
+    """Store the result of parse_source(new_source) on the job."""
+    program, geometry, index = parsed
 
     job.original_source = new_source
     job.program = program
     job.geometry = geometry
     job.program_index = index
+    job.invalidate_final_cache()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from core.gcode_processor import process_gcode_file
+from typing import Tuple
+
+from core.gcode_processor import extract_body_text
 from core.project_model import GCodeJob
 
 
@@ -19,6 +21,9 @@ G0 Z0
 M5
 """
 
+# The final text joins header, body and footer with single newlines
+_FOOTER_TEXT = FOOTER_TEMPLATE.rstrip("\n")
+
 
 def build_final_gcode(job: GCodeJob) -> str:
     """
@@ -30,18 +35,49 @@ def build_final_gcode(job: GCodeJob) -> str:
     - and inserting the current XYZ offsets into the G92 command.
     """
     source = job.original_source or ""
-    processed = process_gcode_file(source)
-    body = "\n".join(processed.body_lines)
+    # Extracted once per source and memoized on the job: offset changes
+    # reuse it
+    body = job.cached_body_text(source)
+    if body is None:
+        body = extract_body_text(source)
+        job.store_body_text(source, body)
 
     header = HEADER_TEMPLATE.format(
         offset_x=job.offset_x,
         offset_y=job.offset_y,
         offset_z=job.offset_z,
-    )
+    ).rstrip("\n")
+
+    if not body:
+        return f"{header}\n{_FOOTER_TEXT}"
+    body = body.rstrip("\n")
+    return f"{header}\n{body}\n{_FOOTER_TEXT}"
+
 
-    parts = [header]
-    if body:
-        parts.append(body)
-    parts.append(FOOTER_TEMPLATE)
+def _final_gcode_key(job: GCodeJob) -> Tuple[str, float, float, float]:
+    return (job.original_source or "", job.offset_x, job.offset_y, job.offset_z)
+
+
+def build_final_gcode_cached(job: GCodeJob) -> str:
+    """
+    Same as build_final_gcode, but memoized on the job.
 
-    return "\n".join(part.rstrip("\n") for part in parts if part)
+    The cache key is the source text plus the offsets, so any edit or
+    offset change invalidates it without explicit bookkeeping.
+    """
+    key = _final_gcode_key(job)
+    text = job.cached_final_gcode(key)
+    if text is None:
+        text = build_final_gcode(job)
+        job.store_final_gcode(key, text)
+    return text
+
+
+def remember_final_gcode(job: GCodeJob, text: str) -> None:
+    """
+    Record `text` as the final G-code of the job in its current state.
+
+    Used after applying offsets: the job source *is* the final text then,
+    so there is no need to strip and re-wrap it again on the next view.
+    """
+    job.store_final_gcode(_final_gcode_key(job), text)
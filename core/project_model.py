@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import uuid
 
 from core.gcode_parser import GCodeProgram
@@ -19,7 +20,7 @@ class GCodeJob:
     Single imported G-code job.
 
     Fields are deliberately simple so we can mutate them in-place after
-    editing G-code in the editor (reparse_job).
+    editing G-code in the editor (apply_parsed_source).
     """
 
     name: str
@@ -41,10 +42,47 @@ class GCodeJob:
     visible: bool = True
     color: Color = (0.9, 0.9, 0.9, 1.0)
 
+    # Memo for core.lume_runtime.build_final_gcode_cached: (key, final text);
+    # use cached_final_gcode / store_final_gcode / invalidate_final_cache
+    _final_cache: Optional[Tuple[Any, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Memo of the source body for build_final_gcode: (source, body text).
+    # Offset changes re-wrap the body without extracting it again.
+    _body_cache: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def display_name(self) -> str:
         """Text used in the Project tree."""
         return self.name
 
+    def cached_final_gcode(self, key: Any) -> Optional[str]:
+        """Final text memoized under `key`, or None if the memo is stale."""
+        cache = self._final_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        return None
+
+    def store_final_gcode(self, key: Any, text: str) -> None:
+        self._final_cache = (key, text)
+
+    def cached_body_text(self, source: str) -> Optional[str]:
+        """Body text memoized for `source`, or None."""
+        cache = self._body_cache
+        if cache is not None and (cache[0] is source or cache[0] == source):
+            return cache[1]
+        return None
+
+    def store_body_text(self, source: str, body: str) -> None:
+        self._body_cache = (source, body)
+
+    def invalidate_final_cache(self) -> None:
+        """Drop the memoized final and body text (and the old source they
+        keep alive)."""
+        self._final_cache = None
+        self._body_cache = None
+
 
 @dataclass
 class Project:
@@ -55,6 +93,40 @@ class Project:
     name: str
     jobs: List[GCodeJob] = field(default_factory=list)
 
+    # Called after the job list changed (set by the UI). While inside
+    # block_updates() notifications are collected and sent once on exit.
+    changed_callback: Optional[Callable[[], None]] = field(
+        default=None, repr=False, compare=False
+    )
+    _updates_blocked: int = field(default=0, init=False, repr=False, compare=False)
+    _changed_while_blocked: bool = field(default=False, init=False, repr=False, compare=False)
+    # id -> job for get_job_by_id; kept in step by add_job
+    _jobs_by_id: Dict[str, GCodeJob] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._jobs_by_id = {job.id: job for job in self.jobs}
+
+    @contextmanager
+    def block_updates(self) -> Iterator[None]:
+        """Batch changes: at most one changed_callback call, on exit."""
+        self._updates_blocked += 1
+        try:
+            yield
+        finally:
+            self._updates_blocked -= 1
+            if not self._updates_blocked and self._changed_while_blocked:
+                self._changed_while_blocked = False
+                self._notify_changed()
+
+    def _notify_changed(self) -> None:
+        if self._updates_blocked:
+            self._changed_while_blocked = True
+            return
+        if self.changed_callback is not None:
+            self.changed_callback()
+
     def add_job(self, job: GCodeJob) -> None:
         """
         Add a job to the project and assign it a colour from a small palette.
@@ -69,9 +141,8 @@ class Project:
         idx = len(self.jobs) % len(palette)
         job.color = palette[idx]
         self.jobs.append(job)
+        self._jobs_by_id[job.id] = job
+        self._notify_changed()
 
     def get_job_by_id(self, job_id: str) -> Optional[GCodeJob]:
-        for job in self.jobs:
-            if job.id == job_id:
-                return job
-        return None
+        return self._jobs_by_id.get(job_id)
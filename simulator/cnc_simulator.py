@@ -3,34 +3,123 @@ Simple serial-based CNC simulator for CIRQWizard.
 
 The simulator opens COM8 at 57600 baud (default), mirrors the G-code protocol used by
 the STM32 CNC controller, prints every command/response pair, and visualizes tool
-motion in a live 3D plot (unless --no-plot is given).
+motion in a live 3D plot (unless --no-plot is given). The plot uses matplotlib by
+default; --gl draws it with pyqtgraph's OpenGL items instead.
 """
 
 from __future__ import annotations
 
 import argparse
+import atexit
+import collections
 import datetime as _dt
-import queue
+import math
+import os
+import re
+import selectors
 import sys
 import textwrap
 import threading
-from typing import Iterable, Optional, Tuple
+import time
+from functools import partial
+from typing import Iterable, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib import cm
 from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
 import serial
 
 
+# The reply to almost every command; shared so reader_loop can send the
+# pre-encoded bytes without building and encoding a string per command.
+_OK_REPLY: Tuple[str, ...] = ("ok",)
+_OK_BYTES = b"ok\n"
+
+
 def timestamp() -> str:
     return _dt.datetime.now().strftime("%H:%M:%S")
 
 
+class _LogPump(threading.Thread):
+    """Writes queued log text to stdout from its own thread.
+
+    Console writes and flushes can take milliseconds; doing them here keeps
+    them off the serial reply path. Each wake-up writes everything queued
+    so far with one write + flush. ``close`` stops the thread and writes
+    whatever is left; text appended afterwards is written directly.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="log-pump", daemon=True)
+        self._chunks: "collections.deque[str]" = collections.deque()
+        self._wake = threading.Event()
+        self._start_lock = threading.Lock()
+        self._stopping = False
+
+    def append(self, text: str) -> None:
+        self._chunks.append(text)
+        if self._stopping:
+            self._write_pending()
+            return
+        if not self.is_alive():
+            with self._start_lock:
+                if not self.is_alive() and not self._stopping:
+                    self.start()
+        self._wake.set()
+
+    def run(self) -> None:
+        while not self._stopping:
+            self._wake.wait()
+            self._wake.clear()
+            self._write_pending()
+
+    def close(self) -> None:
+        with self._start_lock:
+            self._stopping = True
+        if self.is_alive():
+            self._wake.set()
+            self.join()
+        # The pump has exited; this is the only writer left
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        chunks = self._chunks
+        batch = []
+        while chunks:
+            batch.append(chunks.popleft())
+        if batch:
+            sys.stdout.write("".join(batch))
+            sys.stdout.flush()
+
+
+_log_pump = _LogPump()
+atexit.register(_log_pump.close)
+
+
+def echo(message: str) -> None:
+    """Print a status line in order with the queued log output."""
+    _log_pump.append(f"{message}\n")
+
+
+_STRIP_CR = str.maketrans("", "", "\r")
+
+
 def log(direction: str, payload: str) -> None:
-    clean = payload.replace("\r", "").rstrip("\n")
-    for line in clean.splitlines() or [""]:
-        print(f"[{timestamp()}] {direction:<12} {line}")
-    sys.stdout.flush()
+    prefix = f"[{timestamp()}] {direction:<12} "
+    lines = payload.translate(_STRIP_CR).rstrip("\n").split("\n")
+    _log_pump.append("".join(f"{prefix}{line}\n" for line in lines))
+
+
+# (word, unless this word is present, (attribute, value) to set), applied
+# in order as substring matches on the upper-cased command.
+_M_CODE_EFFECTS: Tuple[Tuple[str, Optional[str], Tuple[Tuple[str, bool], ...]], ...] = (
+    ("M3", None, (("spindle_on", True),)),
+    ("M5", None, (("spindle_on", False),)),
+    ("M7", "M70", (("vacuum_on", True),)),
+    ("M8", None, (("syringe_on", True),)),
+    ("M9", None, (("syringe_on", False), ("vacuum_on", False))),
+)
 
 
 class CNCSimulator:
@@ -39,8 +128,9 @@ class CNCSimulator:
         self.syringe_on = False
         self.vacuum_on = False
         self.workspace = "G54"
-        self.wcs_offset = {"X": 0.0, "Y": 0.0, "Z": 0.0}
-        self.position = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        # [X, Y, Z]; see _AXIS_INDEX
+        self.wcs_offset = [0.0, 0.0, 0.0]
+        self.position = [0.0, 0.0, 0.0]
         self.visualizer = visualizer
 
     def handle(self, command: str) -> Iterable[str]:
@@ -48,67 +138,52 @@ class CNCSimulator:
         if not cmd:
             return []
         upper = cmd.upper()
-        code = _normalize_g_code(cmd)
 
         if upper.startswith("$$$RESET"):
             self._reset_state()
-            return ["ok"]
-
-        if code == "G53":
-            self.workspace = "G53"
-            return ["ok"]
-        if code == "G54":
-            self.workspace = "G54"
-            return ["ok"]
-        if code == "G92":
-            self._set_wcs_offset(cmd)
-            return ["ok"]
-
-        if code in {"G0", "G1"}:
-            self._process_motion(cmd, rapid=(code == "G0"))
-            return ["ok"]
-        if code == "G4":
-            return ["ok"]
-
-        if "M3" in upper:
-            self.spindle_on = True
-        if "M5" in upper:
-            self.spindle_on = False
-        if "M7" in upper and "M70" not in upper:
-            self.vacuum_on = True
-        if "M8" in upper:
-            self.syringe_on = True
-        if "M9" in upper:
-            self.syringe_on = False
-            self.vacuum_on = False
-
-        return ["ok"]
+            return _OK_REPLY
+
+        action = self._DISPATCH.get(_normalize_g_code(cmd))
+        if action is not None:
+            action(self, cmd)
+            return _OK_REPLY
+
+        if "M" in upper:
+            for word, unless, effects in _M_CODE_EFFECTS:
+                if word in upper and (unless is None or unless not in upper):
+                    for attr, value in effects:
+                        setattr(self, attr, value)
+
+        return _OK_REPLY
+
+    def _select_machine_coords(self, _command: str) -> None:
+        self.workspace = "G53"
+
+    def _select_work_coords(self, _command: str) -> None:
+        self.workspace = "G54"
+
+    def _dwell(self, _command: str) -> None:
+        pass
 
     def _process_motion(self, command: str, rapid: bool) -> None:
         coords = _parse_axes(command)
         if not coords:
             return
-        machine_coords = self._resolve_target(coords)
         target = self.position.copy()
-        for axis, value in machine_coords.items():
-            target[axis] = value
-        travel = self._vector_distance(self.position, target)
+        offset = None if self.workspace == "G53" else self.wcs_offset
+        for axis, value in coords.items():
+            i = _AXIS_INDEX[axis]
+            target[i] = value if offset is None else value + offset[i]
+        travel = math.dist(self.position, target)
         self.position = target
         if self.visualizer is not None:
-            self.visualizer.enqueue_move(
-                (target.get("X", 0.0), target.get("Y", 0.0), target.get("Z", 0.0)),
-                rapid=rapid,
-            )
-
-    def _vector_distance(self, src: dict, dst: dict) -> float:
-        dx = dst.get("X", src.get("X", 0.0)) - src.get("X", 0.0)
-        dy = dst.get("Y", src.get("Y", 0.0)) - src.get("Y", 0.0)
-        dz = dst.get("Z", src.get("Z", 0.0)) - src.get("Z", 0.0)
-        return (dx ** 2 + dy ** 2 + dz ** 2) ** 0.5
+            # `target` is a fresh list that is never mutated, so it can be
+            # handed over as is
+            self.visualizer.enqueue_move(target, rapid=rapid)
 
     def _apply_reset(self) -> None:
-        self.wcs_offset = {"X": 0.0, "Y": 0.0, "Z": 0.0}
-        self.position = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self.wcs_offset = [0.0, 0.0, 0.0]
+        self.position = [0.0, 0.0, 0.0]
         self.workspace = "G54"
         if self.visualizer is not None:
             self.visualizer.reset_plot()
@@ -118,68 +193,132 @@ class CNCSimulator:
         if not coords:
             return
         for axis, value in coords.items():
-            current = self.position.get(axis, 0.0)
-            self.wcs_offset[axis] = current - value
-
-    def _resolve_target(self, coords: dict[str, float]) -> dict[str, float]:
-        resolved: dict[str, float] = {}
-        for axis, value in coords.items():
-            if self.workspace == "G53":
-                resolved[axis] = value
-            else:
-                resolved[axis] = value + self.wcs_offset.get(axis, 0.0)
-        return resolved
+            i = _AXIS_INDEX[axis]
+            self.wcs_offset[i] = self.position[i] - value
 
     def _reset_state(self) -> None:
         self._apply_reset()
 
+    # Normalised G word -> handler(self, command); anything else falls
+    # through to the M-code checks in handle().
+    _DISPATCH = {
+        "G53": _select_machine_coords,
+        "G54": _select_work_coords,
+        "G92": _set_wcs_offset,
+        "G0": partial(_process_motion, rapid=True),
+        "G1": partial(_process_motion, rapid=False),
+        "G4": _dwell,
+    }
+
+
+_AXIS_INDEX = {"X": 0, "Y": 1, "Z": 2}
+
+
+# Leading G word ("g01x5" -> "01") and whole X/Y/Z tokens with a number.
+# Exponents ("X1e2") are accepted; inf/nan are not, since a non-finite
+# coordinate cannot be plotted anyway.
+_GCODE_RE = re.compile(r"\s*[Gg](\d+)")
+_AXIS_RE = re.compile(
+    r"(?<!\S)([XYZxyz])([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?!\S)"
+)
+
 
 def _normalize_g_code(cmd: str) -> str | None:
-    text = cmd.strip().upper()
-    if not text:
-        return None
-    word = text.split()[0]
-    if not word.startswith("G"):
-        return None
-    digits = ""
-    for ch in word[1:]:
-        if ch.isdigit():
-            digits += ch
-        else:
-            break
-    if not digits:
+    match = _GCODE_RE.match(cmd)
+    if match is None:
         return None
-    return f"G{int(digits)}"
+    return f"G{int(match.group(1))}"
 
 
 def _parse_axes(cmd: str) -> dict[str, float]:
-    axes: dict[str, float] = {}
-    for token in cmd.split():
-        if not token:
-            continue
-        letter = token[0].upper()
-        if letter in ("X", "Y", "Z"):
-            try:
-                axes[letter] = float(token[1:])
-            except ValueError:
-                continue
-    return axes
+    return {
+        match.group(1).upper(): float(match.group(2))
+        for match in _AXIS_RE.finditer(cmd)
+    }
+
+
+# Minimum time between plot redraws (30 fps); moves arriving faster are
+# batched into the next frame.
+_FRAME_INTERVAL = 1.0 / 30.0
 
 
 class Visualizer:
+    # Per path (feed / rapid); longer paths are drawn decimated
+    max_display_points = 50_000
+
     def __init__(self, bed_width: float, bed_height: float, bed_depth: float = 50.0) -> None:
         self.bed_width = bed_width
         self.bed_height = bed_height
         self.bed_depth = bed_depth
-        self.queue: "queue.Queue[Tuple[str, Tuple[float, float, float], bool]]" = queue.Queue()
-        self.points: list[Tuple[float, float, float, bool]] = []
+        # One producer (reader_loop) and one consumer (run_forever): deque
+        # append/popleft are atomic under the GIL, so no lock is needed.
+        # Items are (position, rapid) for a move and None for a reset.
+        self.queue: "collections.deque[Optional[Tuple[Sequence[float], bool]]]" = (
+            collections.deque()
+        )
+        # Path points as parallel arrays (first `_n` rows valid), grown by
+        # doubling so appending a move is O(1) amortised.
+        self._xs = np.empty(4096, dtype=np.float32)
+        self._ys = np.empty(4096, dtype=np.float32)
+        self._zs = np.empty(4096, dtype=np.float32)
+        self._rapid_mask = np.empty(4096, dtype=bool)
+        self._n = 0
+        self._head: Optional[Sequence[float]] = None
         self._stop = threading.Event()
 
-    def enqueue_move(self, position: Tuple[float, float, float], rapid: bool) -> None:
-        self.queue.put(("move", position, rapid))
+    def enqueue_move(self, position: Sequence[float], rapid: bool) -> None:
+        self.queue.append((position, rapid))
 
     def reset_plot(self) -> None:
-        self.queue.put(("reset", (0.0, 0.0, 0.0), False))
+        self.queue.append(None)
+
+    def _append_point(self, x: float, y: float, z: float, rapid: bool) -> None:
+        n = self._n
+        if n == len(self._xs):
+            size = 2 * n
+            self._xs = np.resize(self._xs, size)
+            self._ys = np.resize(self._ys, size)
+            self._zs = np.resize(self._zs, size)
+            self._rapid_mask = np.resize(self._rapid_mask, size)
+        self._xs[n] = x
+        self._ys[n] = y
+        self._zs[n] = z
+        self._rapid_mask[n] = rapid
+        self._n = n + 1
+
+    def _display_path(self, rapid: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """x, y, z of the feed (or rapid) points to draw.
+
+        Paths longer than `max_display_points` keep every k-th point (and
+        always the last one, so the line still reaches the tool), which
+        keeps a frame's cost bounded however long the job runs.
+        """
+        mask = self._rapid_mask[: self._n]
+        idx = np.flatnonzero(mask if rapid else ~mask)
+        step = -(-len(idx) // self.max_display_points)
+        if step > 1:
+            last = idx[-1]
+            idx = idx[::step]
+            if idx[-1] != last:
+                idx = np.append(idx, last)
+        return self._xs[idx], self._ys[idx], self._zs[idx]
+
+    def _drain_events(self) -> bool:
+        """Apply every queued event to the point arrays; True if any."""
+        pending = self.queue
+        if not pending:
+            return False
+        while pending:
+            item = pending.popleft()
+            if item is None:
+                self._n = 0
+                self._head = None
+                continue
+            position, rapid = item
+            x, y, z = position
+            self._append_point(x, y, z, rapid)
+            self._head = position
+        return True
 
     def run_forever(self) -> None:
         plt.ion()
@@ -199,40 +338,43 @@ class Visualizer:
         fig.canvas.mpl_connect("close_event", lambda event: self._stop.set())
         plt.show(block=False)
 
-        while not self._stop.is_set():
-            try:
-                event, position, rapid = self.queue.get(timeout=0.05)
-            except queue.Empty:
-                plt.pause(0.01)
-                continue
+        # Tool marker coordinates, updated in place each frame
+        tool_xyz = np.zeros((3, 1))
+        tool_offsets = (tool_xyz[0], tool_xyz[1], tool_xyz[2])
+        no_tool = (np.empty(0), np.empty(0), np.empty(0))
 
-            if event == "reset":
-                self.points.clear()
-                path_plot.set_data([], [])
-                path_plot.set_3d_properties([])
-                rapid_plot.set_data([], [])
-                rapid_plot.set_3d_properties([])
-                tool_plot._offsets3d = ([], [], [])
-                fig.canvas.draw_idle()
-                plt.pause(0.01)
+        dirty = False
+        last_draw = 0.0
+        while not self._stop.is_set():
+            # Queued moves accumulate in the point arrays and are drawn
+            # together on the next frame.
+            if self._drain_events():
+                dirty = True
+
+            now = time.monotonic()
+            if not dirty or now - last_draw < _FRAME_INTERVAL:
+                # Keep the window responsive without plt.pause, which also
+                # runs a timed event loop and redraws a stale figure.
+                fig.canvas.flush_events()
+                time.sleep(0.005)
                 continue
-
-            if event == "move":
-                x, y, z = position
-                self.points.append((x, y, z, rapid))
-                xs_feed = [p[0] for p in self.points if not p[3]]
-                ys_feed = [p[1] for p in self.points if not p[3]]
-                zs_feed = [p[2] for p in self.points if not p[3]]
-                xs_rapid = [p[0] for p in self.points if p[3]]
-                ys_rapid = [p[1] for p in self.points if p[3]]
-                zs_rapid = [p[2] for p in self.points if p[3]]
-                path_plot.set_data(xs_feed, ys_feed)
-                path_plot.set_3d_properties(zs_feed)
-                rapid_plot.set_data(xs_rapid, ys_rapid)
-                rapid_plot.set_3d_properties(zs_rapid)
-                tool_plot._offsets3d = ([x], [y], [z])
-                fig.canvas.draw_idle()
-                plt.pause(0.01)
+            dirty = False
+            last_draw = now
+
+            xs, ys, zs = self._display_path(rapid=False)
+            path_plot.set_data(xs, ys)
+            path_plot.set_3d_properties(zs)
+            xs, ys, zs = self._display_path(rapid=True)
+            rapid_plot.set_data(xs, ys)
+            rapid_plot.set_3d_properties(zs)
+            head = self._head
+            if head is None:
+                tool_plot._offsets3d = no_tool
+            else:
+                tool_xyz[:, 0] = head
+                tool_plot._offsets3d = tool_offsets
+            fig.canvas.draw_idle()
+            fig.canvas.flush_events()
 
         plt.close(fig)
 
@@ -240,26 +382,131 @@ class Visualizer:
         self._stop.set()
 
 
+class GLVisualizer(Visualizer):
+    """Visualizer drawn with pyqtgraph's OpenGL items, like the Lume viewer.
+
+    Matplotlib's 3D axes project and rasterise every path vertex on the CPU
+    each frame; here the paths live in GPU vertex buffers and a frame is one
+    upload of the current arrays plus a draw call per item.
+    """
+
+    max_display_points = 500_000
+
+    def run_forever(self) -> None:
+        import pyqtgraph.opengl as gl
+        from PySide6.QtCore import QTimer
+        from PySide6.QtGui import QVector3D
+        from PySide6.QtWidgets import QApplication
+
+        app = QApplication.instance() or QApplication([])
+        view = gl.GLViewWidget()
+        view.setWindowTitle("Virtual CNC Volume")
+        view.resize(700, 700)
+
+        grid = gl.GLGridItem()
+        grid.setSize(self.bed_width, self.bed_height)
+        grid.setSpacing(10.0, 10.0)
+        grid.translate(self.bed_width / 2.0, self.bed_height / 2.0, 0.0)
+        view.addItem(grid)
+        path_plot = gl.GLLinePlotItem(color=(1.0, 0.0, 0.0, 1.0), mode="line_strip")
+        rapid_plot = gl.GLLinePlotItem(color=(0.0, 0.4, 1.0, 0.6), mode="line_strip")
+        tool_plot = gl.GLScatterPlotItem(color=(0.0, 0.8, 0.0, 1.0), size=10.0)
+        for item in (path_plot, rapid_plot, tool_plot):
+            view.addItem(item)
+        view.opts["center"] = QVector3D(self.bed_width / 2.0, self.bed_height / 2.0, 0.0)
+        view.setCameraPosition(distance=1.5 * max(self.bed_width, self.bed_height))
+
+        empty = np.zeros((0, 3), dtype=np.float32)
+
+        def frame() -> None:
+            if self._stop.is_set() or not view.isVisible():
+                self._stop.set()
+                app.quit()
+                return
+            if not self._drain_events():
+                return
+            path_plot.setData(pos=np.column_stack(self._display_path(rapid=False)))
+            rapid_plot.setData(pos=np.column_stack(self._display_path(rapid=True)))
+            head = self._head
+            tool_plot.setData(pos=empty if head is None else np.array([head], dtype=np.float32))
+
+        timer = QTimer()
+        timer.timeout.connect(frame)
+        timer.start(int(_FRAME_INTERVAL * 1000))
+        view.show()
+        app.exec()
+        timer.stop()
+
+
 def reader_loop(
     port: serial.Serial,
     handler: CNCSimulator,
     log_responses: bool,
 ) -> None:
-    buffer = ""
+    # POSIX ports are selectable: sleep until data arrives instead of
+    # waking every port timeout. Windows ports have no usable fileno().
+    selector: Optional[selectors.BaseSelector] = None
+    try:
+        fd = port.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    if fd is not None:
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+
+    buffer = bytearray()
     while True:
-        raw = port.read(1)
-        if not raw:
+        if selector is not None and not selector.select(timeout=1.0):
             continue
-        buffer += raw.decode(errors="ignore")
-        if "\n" not in buffer:
+        # Take everything already received in one call; block for a
+        # single byte (up to the port timeout) only when nothing is waiting.
+        waiting = port.in_waiting
+        raw = port.read(waiting if waiting > 0 else 1)
+        if not raw:
             continue
-        line, buffer = buffer.split("\n", 1)
-        line = line.rstrip("\r")
-        log("HOST ➜ SIM", line)
-        for reply in handler.handle(line):
-            port.write((reply + "\n").encode())
+        buffer += raw
+        # Decode complete lines only; the partial tail stays as bytes
+        while (end := buffer.find(b"\n")) != -1:
+            line = buffer[:end].rstrip(b"\r").decode(errors="ignore")
+            del buffer[: end + 1]
+            log("HOST ➜ SIM", line)
+            replies = handler.handle(line)
+            if replies is _OK_REPLY:
+                port.write(_OK_BYTES)
+            elif replies:
+                port.write("".join(reply + "\n" for reply in replies).encode())
             if log_responses:
-                log("SIM ➜ HOST", reply)
+                for reply in replies:
+                    log("SIM ➜ HOST", reply)
+
+
+def _lower_port_latency(port: serial.Serial) -> None:
+    """Best-effort: make short replies leave the USB adapter immediately.
+
+    USB-serial adapters (FTDI) hold received bytes for up to their
+    latency_timer (16 ms by default) before passing them on, which
+    dominates the round trip of one short command and its "ok". Failures
+    (no permission, not a USB adapter, virtual port) are ignored.
+    """
+    if sys.platform.startswith("linux"):
+        # TIOCSSERIAL ASYNC_LOW_LATENCY; the FTDI driver maps it to 1 ms
+        try:
+            port.set_low_latency_mode(True)
+        except (AttributeError, OSError, ValueError):
+            pass
+        name = os.path.basename(os.path.realpath(port.port or ""))
+        latency_path = f"/sys/bus/usb-serial/devices/{name}/latency_timer"
+        try:
+            with open(latency_path, "w", encoding="ascii") as fh:
+                fh.write("1")
+        except OSError:
+            pass
+    elif hasattr(port, "set_buffer_size"):
+        # Windows only: larger driver receive buffer for bursts
+        try:
+            port.set_buffer_size(rx_size=65536)
+        except (OSError, ValueError):
+            pass
 
 
 def main() -> None:
@@ -283,6 +530,11 @@ def main() -> None:
         action="store_true",
         help="Disable the live 3D visualization (terminal chat only)",
     )
+    parser.add_argument(
+        "--gl",
+        action="store_true",
+        help="Draw the live view with OpenGL (pyqtgraph) instead of matplotlib",
+    )
     parser.add_argument(
         "--no-log-responses",
         action="store_false",
@@ -292,10 +544,14 @@ def main() -> None:
     parser.set_defaults(log_responses=True)
     args = parser.parse_args()
 
-    visualizer = None if args.no_plot else Visualizer(args.bed_width, args.bed_height)
+    visualizer: Optional[Visualizer] = None
+    if not args.no_plot:
+        visualizer_cls = GLVisualizer if args.gl else Visualizer
+        visualizer = visualizer_cls(args.bed_width, args.bed_height)
     handler = CNCSimulator(visualizer=visualizer)
-    print(f"Opening {args.port} @ {args.baud} baud. Press Ctrl+C to stop.")
+    echo(f"Opening {args.port} @ {args.baud} baud. Press Ctrl+C to stop.")
     with serial.Serial(args.port, args.baud, timeout=args.timeout) as port:
+        _lower_port_latency(port)
         if visualizer:
             worker = threading.Thread(
                 target=reader_loop,
@@ -306,7 +562,7 @@ def main() -> None:
             try:
                 visualizer.run_forever()
             except KeyboardInterrupt:
-                print("Stopping simulator...")
+                echo("Stopping simulator...")
             finally:
                 visualizer.stop()
                 worker.join(timeout=1.0)
@@ -314,7 +570,7 @@ def main() -> None:
             try:
                 reader_loop(port, handler, args.log_responses)
             except KeyboardInterrupt:
-                print("Simulator stopped.")
+                echo("Simulator stopped.")
 
 
 if __name__ == "__main__":